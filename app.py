@@ -1,8 +1,10 @@
+import os
 from app import create_app, db
 
 app = create_app()
 
+# Development server only; run production deployments through serve.py
 if __name__ == '__main__':
     with app.app_context():
         db.create_all()
-    app.run(host='0.0.0.0', port=5000, debug=True)
\ No newline at end of file
+    app.run(host='0.0.0.0', port=5000, debug=os.environ.get('FLASK_DEBUG') == '1')
@@ -1,32 +1,87 @@
+from threading import Lock
+import click
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
-from flask_bcrypt import Bcrypt
 from flask_jwt_extended import JWTManager
 from flask_cors import CORS
+from app.cache import Cache
+from app.compression import Compression
+from app.passwords import PasswordHasher
 from app.config import Config
 
 db = SQLAlchemy()
-bcrypt = Bcrypt()
 jwt = JWTManager()
+cache = Cache()
+password_hasher = PasswordHasher()
+compression = Compression()
 
 def create_app(config_class=Config):
     app = Flask(__name__)
     app.config.from_object(config_class)
 
+    # Stream multipart uploads to disk instead of buffering them
+    from app.uploads import UploadRequest
+    app.request_class = UploadRequest
+
+    from app.serialization import json_provider
+    app.json = json_provider(app)
+
     # Enable CORS for all routes
     CORS(app)
 
-    db.init_app(app)
-    bcrypt.init_app(app)
+    from app.database import init_database
+    init_database(app)
+    password_hasher.init_app(app)
     jwt.init_app(app)
+    cache.init_app(app)
+    compression.init_app(app)
 
-    from app import routes
-    app.register_blueprint(routes.bp)
+    # Flask-Migrate pulls in Alembic, which only the `flask db` commands
+    # need; skip it when the app is created outside the flask CLI.
+    if app.config.get('LOAD_MIGRATIONS') or click.get_current_context(silent=True) is not None:
+        from flask_migrate import Migrate
+        Migrate(app, db)
+
+    from app.auth import init_identity_cache
+    init_identity_cache(app)
+
+    from app.queries import init_question_cache
+    init_question_cache(app)
 
-    # Initialize the database
-    with app.app_context():
-        db.create_all()
+    if app.config.get('LAZY_BLUEPRINTS'):
+        defer_blueprints(app)
+    else:
+        register_blueprints(app)
+
+    from app.commands import register_commands
+    register_commands(app)
+
+    # On by default for SQLite so a fresh development database works without
+    # `flask db upgrade`; it costs one query once the tables exist.
+    if app.config.get('CREATE_SCHEMA_ON_STARTUP'):
+        from app.database import create_schema
+        create_schema(app)
 
     return app
 
+def register_blueprints(app):
+    from app import routes
+    app.register_blueprint(routes.bp)
+
+# Imports and registers the blueprints when the first request arrives, so
+# CLI commands and cold starts that never serve a request skip them.
+def defer_blueprints(app):
+    wsgi_app = app.wsgi_app
+    lock = Lock()
+    loaded = False
+
+    def load_blueprints(environ, start_response):
+        nonlocal loaded
+        if not loaded:
+            with lock:
+                if not loaded:
+                    register_blueprints(app)
+                    loaded = True
+        return wsgi_app(environ, start_response)
 
+    app.wsgi_app = load_blueprints
@@ -1,15 +1,81 @@
+from collections import namedtuple
 from functools import wraps
-from flask import jsonify, request
-from flask_jwt_extended import jwt_required, get_jwt_identity, create_access_token
+from flask import jsonify, request, g, current_app
+from flask_jwt_extended import jwt_required, get_jwt, get_jwt_identity, create_access_token
 from app.models import User
-from app import bcrypt
+from app import db, cache, password_hasher
+from app.passwords import PasswordHasherBusy
+from app.cache import MemoryBackend
+
+Identity = namedtuple('Identity', ['id', 'role', 'token_version'])
+
+identity_cache = MemoryBackend(max_size=1024, default_ttl=10)
+
+def init_identity_cache(app):
+    identity_cache.max_size = app.config.get('IDENTITY_CACHE_SIZE', 1024)
+    identity_cache.default_ttl = app.config.get('IDENTITY_CACHE_TTL', 10)
+    identity_cache.clear()
+
+# Current token version of a user, or None once the user is deleted. Kept
+# in the shared cache so a bump committed by one worker reaches the others;
+# with the per-process memory backend they see it once their entry expires
+# after IDENTITY_CACHE_TTL seconds.
+def token_version(user_id):
+    key = f'token_version:{user_id}'
+    version = cache.get(key)
+    if version is None:
+        version = db.session.query(User.token_version).filter_by(id=user_id).scalar()
+        if version is not None:
+            cache.set(key, version, ttl=identity_cache.default_ttl)
+    return version
+
+def load_current_user():
+    if 'current_user' in g:
+        return g.current_user
+
+    user_id = int(get_jwt_identity())
+    claims = get_jwt()
+
+    # Tokens issued with role claims are authorized from the claim; the
+    # version they were signed at must still be current, so a role change,
+    # password reset or deletion revokes them.
+    if 'role' in claims and 'ver' in claims:
+        identity = None
+        if token_version(user_id) == claims['ver']:
+            identity = Identity(user_id, claims['role'], claims['ver'])
+        g.current_user = identity
+        return identity
+
+    # The per-process copy is only used while its version is current, so a
+    # role change or deletion in another worker is not served from it
+    identity = identity_cache.get(user_id)
+    if identity is not None and identity.token_version != token_version(user_id):
+        identity = None
+    if identity is None:
+        user = User.query.get(user_id)
+        if user:
+            identity = Identity(user.id, user.role, user.token_version)
+            identity_cache.set(identity.id, identity)
+            cache.set(f'token_version:{user.id}', user.token_version, ttl=identity_cache.default_ttl)
+
+    g.current_user = identity
+    return identity
+
+# Call after committing a change to the user's role, password or existence
+def invalidate_user(user_id):
+    identity_cache.delete(user_id)
+    cache.delete(f'token_version:{user_id}')
+
+# Revokes tokens issued with role claims once committed; follow the commit
+# with invalidate_user().
+def bump_token_version(user):
+    user.token_version = (user.token_version or 0) + 1
 
 def admin_required(f):
     @wraps(f)
     @jwt_required()
     def decorated_function(*args, **kwargs):
-        current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
+        user = load_current_user()
         if not user or user.role != 'admin':
             return jsonify({'message': 'Admin access required'}), 403
         return f(*args, **kwargs)
@@ -19,19 +85,41 @@ def client_required(f):
     @wraps(f)
     @jwt_required()
     def decorated_function(*args, **kwargs):
-        current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
+        user = load_current_user()
         if not user:
             return jsonify({'message': 'Authentication required'}), 401
         return f(*args, **kwargs)
     return decorated_function
 
+# The session is closed before the password is checked, so the pooled
+# connection is not held for the duration of a bcrypt hash. The returned
+# user is detached with its columns loaded.
 def authenticate_user(email, password):
     user = User.query.filter_by(email=email).first()
-    if user and bcrypt.check_password_hash(user.password, password):
+    stored_hash = user.password if user else None
+    db.session.close()
+    if user and password_hasher.check_password_hash(stored_hash, password):
+        if password_hasher.needs_rehash(stored_hash):
+            rehash_password(user, stored_hash, password)
         return user
     return None
 
+# Moves a hash stored at an outdated cost to BCRYPT_LOG_ROUNDS once the
+# plain password is known. Skipped when the hasher is busy, or when the
+# password changed since stored_hash was read; the next login tries again.
+def rehash_password(user, stored_hash, password):
+    try:
+        new_hash = password_hasher.generate_password_hash(password)
+    except PasswordHasherBusy:
+        return
+    User.query.filter_by(id=user.id, password=stored_hash).update({'password': new_hash})
+    db.session.commit()
+    user.password = new_hash
+
 def create_user_token(user):
+    if current_app.config.get('JWT_ROLE_CLAIMS'):
+        return create_access_token(
+            identity=str(user.id),
+            additional_claims={'role': user.role, 'ver': user.token_version or 0}
+        )
     return create_access_token(identity=str(user.id))
-
@@ -0,0 +1,363 @@
+import abc
+import functools
+import json
+import re
+import socket
+import socketserver
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlparse
+
+class CacheBackend(abc.ABC):
+    # Whether every worker process sees the same entries
+    shared = False
+
+    @abc.abstractmethod
+    def get(self, key):
+        pass
+
+    @abc.abstractmethod
+    def set(self, key, value, ttl=None):
+        pass
+
+    @abc.abstractmethod
+    def delete(self, key):
+        pass
+
+    @abc.abstractmethod
+    def incr(self, key):
+        pass
+
+    @abc.abstractmethod
+    def clear(self):
+        pass
+
+    def stats(self):
+        return {}
+
+class MemoryBackend(CacheBackend):
+    """In-process LRU with optional per-entry TTL. Values are stored by reference."""
+
+    def __init__(self, max_size=1024, default_ttl=None):
+        self.max_size = max_size
+        self.default_ttl = default_ttl
+        self.evictions = 0
+        self.expirations = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at is not None and expires_at < time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        ttl = ttl if ttl is not None else self.default_ttl
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def incr(self, key):
+        with self._lock:
+            value, expires_at = self._entries.get(key, (0, None))
+            value = int(value) + 1
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def keys(self):
+        with self._lock:
+            return list(self._entries)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'evictions': self.evictions,
+                'expirations': self.expirations
+            }
+
+class CacheConnectionError(Exception):
+    pass
+
+class RedisBackend(CacheBackend):
+    """Minimal RESP client for Redis or the bundled CacheServer. Values are JSON-encoded.
+
+    Connection failures are treated as cache misses so an unavailable cache
+    server slows requests down instead of failing them.
+    """
+
+    shared = True
+
+    def __init__(self, url='redis://127.0.0.1:6379/0', timeout=0.5, key_prefix='educational_app:'):
+        parsed = urlparse(url)
+        self.host = parsed.hostname or '127.0.0.1'
+        self.port = parsed.port or 6379
+        self.db = int(parsed.path.lstrip('/') or 0)
+        self.timeout = timeout
+        self.key_prefix = key_prefix
+        self.errors = 0
+        self._local = threading.local()
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+            conn = (sock, sock.makefile('rb'))
+            self._local.conn = conn
+            if self.db:
+                self._send(conn, 'SELECT', self.db)
+        return conn
+
+    def _disconnect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn[1].close()
+            conn[0].close()
+            self._local.conn = None
+
+    def _send(self, conn, *args):
+        sock, reader = conn
+        sock.sendall(encode_command(args))
+        return read_reply(reader)
+
+    def execute(self, *args):
+        try:
+            return self._send(self._connection(), *args)
+        except (OSError, CacheConnectionError):
+            self.errors += 1
+            self._disconnect()
+            return None
+
+    def get(self, key):
+        value = self.execute('GET', self.key_prefix + key)
+        return json.loads(value) if value is not None else None
+
+    def set(self, key, value, ttl=None):
+        args = ['SET', self.key_prefix + key, json.dumps(value)]
+        if ttl:
+            args += ['EX', int(ttl)]
+        self.execute(*args)
+
+    def delete(self, key):
+        self.execute('DEL', self.key_prefix + key)
+
+    def incr(self, key):
+        return self.execute('INCR', self.key_prefix + key)
+
+    # Deletes this app's keys only, so a Redis database shared with other
+    # applications keeps their entries
+    def clear(self):
+        pattern = re.sub(r'([*?\[\]\\])', r'\\\1', self.key_prefix) + '*'
+        cursor = '0'
+        while True:
+            reply = self.execute('SCAN', cursor, 'MATCH', pattern, 'COUNT', 1000)
+            if reply is None:
+                return
+            cursor, keys = reply
+            if keys:
+                self.execute('DEL', *keys)
+            if cursor == '0':
+                return
+
+    def stats(self):
+        return {'errors': self.errors}
+
+def encode_command(args):
+    parts = [b'*%d\r\n' % len(args)]
+    for arg in args:
+        data = arg if isinstance(arg, bytes) else str(arg).encode('utf-8')
+        parts.append(b'$%d\r\n%s\r\n' % (len(data), data))
+    return b''.join(parts)
+
+def read_reply(reader):
+    line = reader.readline()
+    if not line:
+        raise CacheConnectionError('Connection closed')
+    kind, payload = line[:1], line[1:-2]
+    if kind == b'+':
+        return payload.decode('utf-8')
+    if kind == b'-':
+        raise CacheConnectionError(payload.decode('utf-8'))
+    if kind == b':':
+        return int(payload)
+    if kind == b'$':
+        length = int(payload)
+        if length < 0:
+            return None
+        data = reader.read(length + 2)[:-2]
+        return data.decode('utf-8')
+    if kind == b'*':
+        count = int(payload)
+        return None if count < 0 else [read_reply(reader) for _ in range(count)]
+    raise CacheConnectionError(f'Unexpected reply: {line!r}')
+
+class Cache:
+    """Cache frontend: hit/miss counters, tag invalidation and memoization over a backend.
+
+    Tags are versioned counters stored in the backend. Keys written under a
+    tag embed its current version, so invalidate_tags() only has to bump the
+    counter for every entry carrying that tag to become unreachable.
+    """
+
+    def __init__(self, backend=None):
+        self.backend = backend or MemoryBackend()
+        self.default_ttl = None
+        self.hits = 0
+        self.misses = 0
+
+    def init_app(self, app):
+        if app.config.get('CACHE_BACKEND') == 'redis':
+            self.backend = RedisBackend(app.config['CACHE_URL'])
+        else:
+            self.backend = MemoryBackend(app.config.get('CACHE_MAX_SIZE', 1024))
+        self.default_ttl = app.config.get('CACHE_DEFAULT_TTL')
+        self.hits = self.misses = 0
+        app.extensions['cache'] = self
+
+    def _key(self, key, tags):
+        if not tags:
+            return key
+        versions = ','.join(f'{tag}={self.backend.get("tag:" + tag) or 0}' for tag in sorted(tags))
+        return f'{key}|{versions}'
+
+    def get(self, key, tags=()):
+        value = self.backend.get(self._key(key, tags))
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, key, value, ttl=None, tags=()):
+        self.backend.set(self._key(key, tags), value, ttl if ttl is not None else self.default_ttl)
+
+    def delete(self, key):
+        self.backend.delete(key)
+
+    def invalidate_tags(self, *tags):
+        for tag in tags:
+            self.backend.incr('tag:' + tag)
+
+    def clear(self):
+        self.backend.clear()
+
+    # shared=True leaves results uncached unless the backend is shared by
+    # every process, for values whose tags are invalidated by whichever
+    # worker made the change.
+    def memoize(self, ttl=None, tags=(), key_prefix=None, shared=False):
+        def decorator(f):
+            prefix = key_prefix or f'{f.__module__}.{f.__qualname__}'
+
+            @functools.wraps(f)
+            def decorated_function(*args, **kwargs):
+                if shared and not self.backend.shared:
+                    return f(*args, **kwargs)
+                key = f'{prefix}:{json.dumps([args, kwargs], sort_keys=True, default=str)}'
+                value = self.get(key, tags)
+                if value is None:
+                    value = f(*args, **kwargs)
+                    self.set(key, value, ttl, tags)
+                return value
+            return decorated_function
+        return decorator
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'backend': type(self.backend).__name__,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / total * 100, 2) if total else 0,
+            **self.backend.stats()
+        }
+
+# Redis MATCH pattern as a regex: * and ? wildcards, backslash escapes
+def glob_pattern(pattern):
+    parts = re.findall(r'\\.|\*|\?|[^\\*?]+', pattern)
+    return re.compile(''.join(
+        '.*' if part == '*' else '.' if part == '?' else re.escape(part[1:] if part.startswith('\\') else part)
+        for part in parts
+    ), re.DOTALL)
+
+class CacheServer(socketserver.ThreadingTCPServer):
+    """Redis-compatible stand-in (GET/SET/DEL/INCR/SCAN/FLUSHDB/PING/SELECT) backed by MemoryBackend.
+
+    Lets several worker processes on one host share a cache without a Redis install.
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address, max_size=100000):
+        self.store = MemoryBackend(max_size)
+        super().__init__(address, CacheRequestHandler)
+
+class CacheRequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        while True:
+            try:
+                command = read_reply(self.rfile)
+            except CacheConnectionError:
+                return
+            if not isinstance(command, list) or not command:
+                self.wfile.write(b'-ERR protocol error\r\n')
+                return
+            self.wfile.write(self.dispatch(command[0].upper(), command[1:]))
+
+    def dispatch(self, name, args):
+        store = self.server.store
+        if name == 'PING':
+            return b'+PONG\r\n'
+        if name == 'SELECT':
+            return b'+OK\r\n'
+        if name == 'GET':
+            value = store.get(args[0])
+            if value is None:
+                return b'$-1\r\n'
+            data = str(value).encode('utf-8')
+            return b'$%d\r\n%s\r\n' % (len(data), data)
+        if name == 'SET':
+            ttl = int(args[3]) if len(args) >= 4 and args[2].upper() == 'EX' else None
+            store.set(args[0], args[1], ttl)
+            return b'+OK\r\n'
+        if name == 'DEL':
+            for key in args:
+                store.delete(key)
+            return b':%d\r\n' % len(args)
+        if name == 'INCR':
+            return b':%d\r\n' % store.incr(args[0])
+        if name == 'SCAN':
+            # A single pass over every key; COUNT is ignored
+            options = dict(zip((arg.upper() for arg in args[1::2]), args[2::2]))
+            keys = store.keys()
+            if 'MATCH' in options:
+                match = glob_pattern(options['MATCH'])
+                keys = [key for key in keys if match.fullmatch(key)]
+            return b'*2\r\n$1\r\n0\r\n' + encode_command(keys)
+        if name == 'FLUSHDB':
+            store.clear()
+            return b'+OK\r\n'
+        return b'-ERR unknown command\r\n'
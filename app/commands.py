@@ -0,0 +1,120 @@
+import click
+from flask.cli import AppGroup
+
+progress_cli = AppGroup('progress', help='Video progress storage commands.')
+
+@progress_cli.command('convert')
+@click.argument('layout', type=click.Choice(['bitset', 'rows']))
+def convert_progress(layout):
+    """Rewrite all video progress into the given storage layout."""
+    from app.progress import convert_progress_storage
+    converted = convert_progress_storage(layout)
+    click.echo(f'Converted {converted} user levels to {layout} progress storage.')
+    click.echo(f'Set PROGRESS_STORAGE={layout} and restart the app to use it.')
+
+statistics_cli = AppGroup('statistics', help='Statistics rollup commands.')
+
+@statistics_cli.command('rebuild')
+def rebuild_statistics():
+    """Recompute the statistics rollups from the source tables."""
+    from app.statistics import rebuild_statistics
+    drift = rebuild_statistics()
+    for line in drift:
+        click.echo(line)
+    click.echo(f'Statistics rebuilt, {len(drift)} stored values differed.')
+
+passwords_cli = AppGroup('passwords', help='Password hashing commands.')
+
+@passwords_cli.command('calibrate')
+@click.option('--target-ms', default=250, type=float, help='Longest acceptable time for one hash.')
+@click.option('--max-rounds', default=16, type=int)
+def calibrate_passwords(target_ms, max_rounds):
+    """Time bcrypt on this host and recommend a cost for the target latency."""
+    from flask import current_app
+    from app.passwords import calibrate_rounds
+    rounds, timings = calibrate_rounds(target_ms, max_rounds=max_rounds)
+    for cost, ms in timings.items():
+        click.echo(f'cost {cost:2d}: {ms:8.1f} ms')
+    click.echo(f'Recommended BCRYPT_LOG_ROUNDS={rounds} (currently {current_app.config.get("BCRYPT_LOG_ROUNDS", 12)}).')
+    click.echo('Existing passwords are rehashed at the new cost on their next successful login.')
+
+@passwords_cli.command('costs')
+def password_costs():
+    """Count stored password hashes by bcrypt cost."""
+    from app import db
+    from app.models import User
+    from app.passwords import hash_cost
+    costs = {}
+    for (password,) in db.session.query(User.password).yield_per(1000):
+        cost = hash_cost(password)
+        costs[cost] = costs.get(cost, 0) + 1
+    for cost, count in sorted(costs.items(), key=lambda item: (item[0] is None, item[0])):
+        click.echo(f'cost {cost if cost is not None else "unknown"}: {count} users')
+
+cache_cli = AppGroup('cache', help='Shared cache commands.')
+
+@cache_cli.command('serve')
+@click.option('--host', default='127.0.0.1')
+@click.option('--port', default=6379, type=int)
+@click.option('--max-size', default=100000, type=int)
+def serve_cache(host, port, max_size):
+    """Run the Redis-compatible stand-in cache server."""
+    from app.cache import CacheServer
+    server = CacheServer((host, port), max_size)
+    click.echo(f'Cache server listening on {host}:{port}')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+@cache_cli.command('clear')
+def clear_cache():
+    """Drop this app's entries from the configured cache backend."""
+    from app import cache
+    cache.clear()
+    click.echo('Cache cleared.')
+
+uploads_cli = AppGroup('uploads', help='Uploaded file commands.')
+
+@uploads_cli.command('dedupe')
+def dedupe_uploads():
+    """Move level images stored under uuid names onto content-hash names."""
+    from app.uploads import content_address_uploads
+    updated = content_address_uploads()
+    click.echo(f'{updated} levels now point at content-addressed images.')
+    click.echo('Run `flask uploads gc` to remove the files they no longer use.')
+
+@uploads_cli.command('variants')
+def generate_image_variants():
+    """Generate missing resized variants of every level image."""
+    from flask import current_app
+    from app import db
+    from app.images import generate_variants_logged
+    from app.models import Level
+    from app.uploads import CONTENT_ADDRESSED_NAME, upload_filename
+    created = 0
+    for (image_path,) in db.session.query(Level.image_path).distinct():
+        filename = upload_filename(image_path)
+        if filename and CONTENT_ADDRESSED_NAME.match(filename):
+            created += generate_variants_logged(current_app._get_current_object(), filename)
+    click.echo(f'Created {created} image variants.')
+
+@uploads_cli.command('gc')
+@click.option('--dry-run', is_flag=True, help='List the files without deleting them.')
+def collect_uploads(dry_run):
+    """Delete uploaded files that no level refers to."""
+    from app.uploads import collect_upload_garbage
+    removed = collect_upload_garbage(dry_run)
+    for filename, size in removed:
+        click.echo(f'{filename} ({size} bytes)')
+    action = 'Would remove' if dry_run else 'Removed'
+    click.echo(f'{action} {len(removed)} files, {sum(size for _, size in removed)} bytes.')
+
+def register_commands(app):
+    app.cli.add_command(progress_cli)
+    app.cli.add_command(statistics_cli)
+    app.cli.add_command(passwords_cli)
+    app.cli.add_command(cache_cli)
+    app.cli.add_command(uploads_cli)
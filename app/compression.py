@@ -0,0 +1,71 @@
+import gzip
+
+from flask import current_app, request
+
+try:
+    import brotli
+except ImportError:
+    try:
+        import brotlicffi as brotli
+    except ImportError:
+        brotli = None
+
+def available_encodings():
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+def compress(data, encoding, config):
+    if encoding == 'br':
+        return brotli.compress(data, quality=config.get('COMPRESS_BROTLI_QUALITY', 4))
+    return gzip.compress(data, compresslevel=config.get('COMPRESS_GZIP_LEVEL', 6), mtime=0)
+
+class Compression:
+    """Compresses buffered text responses for clients that accept it.
+
+    Brotli (pip install brotli) is preferred over gzip when the client
+    accepts both equally. Streamed and file responses, bodies smaller than
+    COMPRESS_MIN_SIZE and responses that already carry a Content-Encoding
+    are sent as they are.
+    """
+
+    def init_app(self, app):
+        app.after_request(self.compress_response)
+        app.extensions['compression'] = self
+
+    def compress_response(self, response):
+        config = current_app.config
+
+        if not config.get('COMPRESS_RESPONSES', True):
+            return response
+        if response.mimetype not in config.get('COMPRESS_MIMETYPES', ()):
+            return response
+        if response.direct_passthrough or response.is_streamed or 'Content-Encoding' in response.headers:
+            return response
+        if response.status_code == 304:
+            # Repeat the validator the way the client got it: a weak one
+            # means the cached copy is the compressed 200
+            etag, weak = response.get_etag()
+            if etag and not weak and request.if_none_match.is_weak(etag):
+                response.set_etag(etag, weak=True)
+            response.vary.add('Accept-Encoding')
+            return response
+        if response.status_code < 200 or response.status_code in (204, 206):
+            return response
+
+        data = response.get_data()
+        if len(data) < config.get('COMPRESS_MIN_SIZE', 1024):
+            return response
+
+        response.vary.add('Accept-Encoding')
+        encoding = request.accept_encodings.best_match(available_encodings())
+        if encoding is None:
+            return response
+
+        response.set_data(compress(data, encoding, config))
+        response.headers['Content-Encoding'] = encoding
+        # The compressed body is a different representation of the same
+        # content, so a strong validator computed from the plain body no
+        # longer applies byte for byte.
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        return response
@@ -5,6 +5,51 @@ class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'your_secret_key'
     JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY') or 'jwt_secret_key'
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=24)
+    JWT_ROLE_CLAIMS = os.environ.get('JWT_ROLE_CLAIMS', '').lower() in ('1', 'true', 'yes')
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or 'sqlite:///site.db'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
-    UPLOAD_FOLDER = os.path.join(os.getcwd(), 'Uploads', 'levels') 
\ No newline at end of file
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 5))
+    DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW', 10))
+    DB_POOL_TIMEOUT = int(os.environ.get('DB_POOL_TIMEOUT', 30))
+    DB_POOL_RECYCLE = int(os.environ.get('DB_POOL_RECYCLE', 1800)) # seconds; ignored for SQLite
+    DB_POOL_PRE_PING = os.environ.get('DB_POOL_PRE_PING', '1').lower() in ('1', 'true', 'yes') # ignored for SQLite
+    SQLITE_JOURNAL_MODE = os.environ.get('SQLITE_JOURNAL_MODE', 'wal') # empty keeps SQLite's default for each pragma
+    SQLITE_SYNCHRONOUS = os.environ.get('SQLITE_SYNCHRONOUS', 'normal')
+    SQLITE_BUSY_TIMEOUT = os.environ.get('SQLITE_BUSY_TIMEOUT', '5000') # milliseconds
+    SQLITE_CACHE_SIZE = os.environ.get('SQLITE_CACHE_SIZE', '-65536') # negative values are KiB
+    SQLITE_MMAP_SIZE = os.environ.get('SQLITE_MMAP_SIZE', '268435456') # bytes
+    CREATE_SCHEMA_ON_STARTUP = os.environ.get('CREATE_SCHEMA_ON_STARTUP', '1' if SQLALCHEMY_DATABASE_URI.startswith('sqlite') else '').lower() in ('1', 'true', 'yes') # only acts on an empty database
+    LAZY_BLUEPRINTS = os.environ.get('LAZY_BLUEPRINTS', '').lower() in ('1', 'true', 'yes')
+    LOAD_MIGRATIONS = os.environ.get('LOAD_MIGRATIONS', '').lower() in ('1', 'true', 'yes')
+    MAX_PAGE_SIZE = int(os.environ.get('MAX_PAGE_SIZE', 500))
+    STREAM_CHUNK_SIZE = int(os.environ.get('STREAM_CHUNK_SIZE', 500))
+    UPLOAD_FOLDER = os.path.join(os.getcwd(), 'Uploads', 'levels')
+    MAX_CONTENT_LENGTH = int(os.environ.get('MAX_CONTENT_LENGTH', 16 * 1024 * 1024)) # bytes per request; larger bodies get 413
+    UPLOAD_CHUNK_SIZE = int(os.environ.get('UPLOAD_CHUNK_SIZE', 65536))
+    UPLOAD_GC_GRACE = int(os.environ.get('UPLOAD_GC_GRACE', 3600)) # seconds before an unreferenced upload may be deleted
+    IMAGE_VARIANT_WIDTHS = os.environ.get('IMAGE_VARIANT_WIDTHS', '160,320,640')
+    IMAGE_VARIANT_FORMATS = os.environ.get('IMAGE_VARIANT_FORMATS', 'webp,jpeg')
+    IMAGE_VARIANT_QUALITY = int(os.environ.get('IMAGE_VARIANT_QUALITY', 80))
+    IMAGE_VARIANT_WORKERS = int(os.environ.get('IMAGE_VARIANT_WORKERS', 1)) # 0 generates variants on the request thread
+    UPLOAD_CACHE_MAX_AGE = int(os.environ.get('UPLOAD_CACHE_MAX_AGE', 31536000)) # content-hash named uploads never change
+    UPLOAD_ACCEL_REDIRECT = os.environ.get('UPLOAD_ACCEL_REDIRECT', '') # nginx internal location, e.g. /internal/uploads/levels
+    USE_X_SENDFILE = os.environ.get('USE_X_SENDFILE', '').lower() in ('1', 'true', 'yes')
+    IDENTITY_CACHE_SIZE = int(os.environ.get('IDENTITY_CACHE_SIZE', 1024))
+    IDENTITY_CACHE_TTL = int(os.environ.get('IDENTITY_CACHE_TTL', 10)) # seconds other workers may act on a stale role with CACHE_BACKEND = 'memory'
+    QUESTION_CACHE_SIZE = int(os.environ.get('QUESTION_CACHE_SIZE', 4096))
+    CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'memory') # 'memory' or 'redis'
+    CACHE_URL = os.environ.get('CACHE_URL', 'redis://127.0.0.1:6379/0')
+    CACHE_MAX_SIZE = int(os.environ.get('CACHE_MAX_SIZE', 1024))
+    CACHE_DEFAULT_TTL = int(os.environ.get('CACHE_DEFAULT_TTL', 300))
+    BCRYPT_LOG_ROUNDS = int(os.environ.get('BCRYPT_LOG_ROUNDS', 12))
+    PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', 2)) # 0 hashes on the request thread
+    PASSWORD_HASH_EXECUTOR = os.environ.get('PASSWORD_HASH_EXECUTOR', 'thread') # 'thread' or 'process'
+    PASSWORD_HASH_MAX_PENDING = int(os.environ.get('PASSWORD_HASH_MAX_PENDING', 32))
+    PASSWORD_HASH_TIMEOUT = int(os.environ.get('PASSWORD_HASH_TIMEOUT', 10))
+    JSON_PROVIDER = os.environ.get('JSON_PROVIDER', 'orjson') # 'orjson' (when installed) or 'stdlib'
+    COMPRESS_RESPONSES = os.environ.get('COMPRESS_RESPONSES', '1').lower() in ('1', 'true', 'yes')
+    COMPRESS_MIN_SIZE = int(os.environ.get('COMPRESS_MIN_SIZE', 1024)) # bytes; smaller bodies are sent as they are
+    COMPRESS_GZIP_LEVEL = int(os.environ.get('COMPRESS_GZIP_LEVEL', 6))
+    COMPRESS_BROTLI_QUALITY = int(os.environ.get('COMPRESS_BROTLI_QUALITY', 4))
+    COMPRESS_MIMETYPES = ('application/json', 'text/html', 'text/plain', 'text/css', 'application/javascript')
+    PROGRESS_STORAGE = os.environ.get('PROGRESS_STORAGE', 'rows') # 'rows' or 'bitset'
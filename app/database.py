@@ -0,0 +1,92 @@
+import os
+
+from sqlalchemy import event, inspect
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import QueuePool
+
+from app import db
+
+# Applied to every new SQLite connection, busy_timeout first so switching
+# the journal mode waits for other connections instead of failing.
+SQLITE_PRAGMAS = ('busy_timeout', 'journal_mode', 'synchronous', 'cache_size', 'mmap_size')
+
+def is_sqlite(url):
+    return url.get_backend_name() == 'sqlite'
+
+def is_sqlite_memory(url):
+    return url.database in (None, '', ':memory:') or url.query.get('mode') == 'memory'
+
+# Pool settings for the configured database. In-memory SQLite keeps
+# Flask-SQLAlchemy's single shared connection; file SQLite gets a QueuePool
+# so threads reuse connections (and their page cache) instead of reopening
+# the file. Other servers also recycle and ping pooled connections.
+def engine_options(config):
+    url = make_url(config['SQLALCHEMY_DATABASE_URI'])
+    if is_sqlite(url) and is_sqlite_memory(url):
+        return {}
+
+    options = {
+        'pool_size': config.get('DB_POOL_SIZE', 5),
+        'max_overflow': config.get('DB_MAX_OVERFLOW', 10),
+        'pool_timeout': config.get('DB_POOL_TIMEOUT', 30)
+    }
+    if is_sqlite(url):
+        options['poolclass'] = QueuePool
+    else:
+        options['pool_recycle'] = config.get('DB_POOL_RECYCLE', -1)
+        options['pool_pre_ping'] = config.get('DB_POOL_PRE_PING', False)
+    return options
+
+def sqlite_pragmas(config):
+    pragmas = {}
+    for name in SQLITE_PRAGMAS:
+        value = config.get(f'SQLITE_{name.upper()}')
+        if value not in (None, ''):
+            pragmas[name] = value
+    return pragmas
+
+def apply_sqlite_pragmas(engine, pragmas):
+    @event.listens_for(engine, 'connect')
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
+        cursor.close()
+
+# Explicit SQLALCHEMY_ENGINE_OPTIONS take precedence over the DB_POOL_*
+# settings.
+def init_database(app):
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = dict(
+        engine_options(app.config),
+        **app.config.get('SQLALCHEMY_ENGINE_OPTIONS', {})
+    )
+    db.init_app(app)
+
+    pragmas = sqlite_pragmas(app.config)
+    if not pragmas:
+        return
+    with app.app_context():
+        for engine in db.engines.values():
+            if is_sqlite(engine.url):
+                apply_sqlite_pragmas(engine, pragmas)
+
+# Creates the tables of an empty database and stamps it with the latest
+# migration, so a later `flask db upgrade` has nothing to apply. Databases
+# that already have tables are left to the migrations. Returns whether the
+# schema was created.
+def create_schema(app):
+    with app.app_context():
+        if inspect(db.engine).get_table_names():
+            return False
+        db.create_all()
+
+        directory = os.path.join(os.path.dirname(app.root_path), 'migrations')
+        if is_sqlite_memory(db.engine.url) or not os.path.isdir(directory):
+            return True
+        # Stamped without running migrations/env.py, whose logging setup
+        # would disable the loggers of the process creating the app
+        from alembic.runtime.migration import MigrationContext
+        from alembic.script import ScriptDirectory
+        with db.engine.begin() as connection:
+            MigrationContext.configure(connection).stamp(ScriptDirectory(directory), 'heads')
+    return True
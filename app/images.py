@@ -0,0 +1,132 @@
+import logging
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import current_app
+
+from app import db
+from app.uploads import CONTENT_ADDRESSED_NAME, UPLOAD_URL_PREFIX, upload_filename, variant_filename
+
+logger = logging.getLogger(__name__)
+
+# Resized copies of level images for catalog thumbnails, stored beside the
+# original as <sha256>-w<width>.<ext>. They are generated in the background
+# after an image is saved and need Pillow (pip install Pillow); without it
+# levels simply have no variants.
+VARIANT_FORMATS = {'webp': ('WEBP', '.webp'), 'jpeg': ('JPEG', '.jpg')}
+
+_executor = None
+_executor_pid = None
+_lock = threading.Lock()
+
+def variant_widths(config):
+    return sorted(int(width) for width in str(config.get('IMAGE_VARIANT_WIDTHS', '')).split(',') if width.strip())
+
+def variant_formats(config):
+    return [name.strip() for name in str(config.get('IMAGE_VARIANT_FORMATS', '')).split(',') if name.strip() in VARIANT_FORMATS]
+
+def executor(workers):
+    global _executor, _executor_pid
+    with _lock:
+        if _executor is None or _executor_pid != os.getpid():
+            _executor = ThreadPoolExecutor(workers, thread_name_prefix='image-variants')
+            _executor_pid = os.getpid()
+        return _executor
+
+def save_image(image, path, pillow_format, quality):
+    fd, temp_path = tempfile.mkstemp(prefix='.variant-', suffix='.tmp', dir=os.path.dirname(path))
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            image.save(f, pillow_format, quality=quality)
+        os.chmod(temp_path, 0o644)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+# Writes every missing variant narrower than the original and returns how
+# many were created. Variants are never upscaled.
+def generate_variants(app, filename):
+    try:
+        from PIL import Image, ImageOps
+    except ImportError:
+        return 0
+
+    match = CONTENT_ADDRESSED_NAME.match(filename)
+    if not match or match.group(2):
+        return 0
+    digest = match.group(1)
+    folder = app.config['UPLOAD_FOLDER']
+    quality = app.config.get('IMAGE_VARIANT_QUALITY', 80)
+
+    created = 0
+    try:
+        original = Image.open(os.path.join(folder, filename))
+    except (FileNotFoundError, Image.UnidentifiedImageError) as e:
+        logger.warning(f'No variants generated for {filename}: {e}')
+        return 0
+    with original:
+        image = ImageOps.exif_transpose(original)
+        for width in variant_widths(app.config):
+            if width >= image.width:
+                continue
+            resized = None
+            for name in variant_formats(app.config):
+                pillow_format, extension = VARIANT_FORMATS[name]
+                path = os.path.join(folder, variant_filename(digest, width, extension))
+                if os.path.exists(path):
+                    continue
+                if resized is None:
+                    resized = image.resize((width, max(1, round(image.height * width / image.width))), Image.LANCZOS)
+                save_image(resized if pillow_format == 'WEBP' else resized.convert('RGB'), path, pillow_format, quality)
+                created += 1
+
+    # Cached catalogs list the variants that existed when they were built
+    if created:
+        from app.queries import bump_catalog_version
+        with app.app_context():
+            bump_catalog_version()
+            db.session.commit()
+    return created
+
+def generate_variants_logged(app, filename):
+    try:
+        return generate_variants(app, filename)
+    except Exception:
+        logger.exception(f'Generating variants of {filename} failed')
+        return 0
+
+# Queues variant generation for a stored level image. Call after committing
+# the level. IMAGE_VARIANT_WORKERS = 0 generates them on the calling thread.
+def schedule_variants(image_path):
+    filename = upload_filename(image_path)
+    if filename is None or not CONTENT_ADDRESSED_NAME.match(filename):
+        return None
+    app = current_app._get_current_object()
+    workers = app.config.get('IMAGE_VARIANT_WORKERS', 1)
+    if not workers:
+        return generate_variants_logged(app, filename)
+    return executor(workers).submit(generate_variants_logged, app, filename)
+
+# {'webp': '<url> 160w, <url> 320w', 'jpeg': ...} for the variants of an
+# image that exist, ready for <source srcset>.
+def image_srcset(image_path):
+    filename = upload_filename(image_path)
+    match = CONTENT_ADDRESSED_NAME.match(filename or '')
+    if not match:
+        return {}
+
+    folder = current_app.config['UPLOAD_FOLDER']
+    srcset = {}
+    for name in variant_formats(current_app.config):
+        _, extension = VARIANT_FORMATS[name]
+        candidates = []
+        for width in variant_widths(current_app.config):
+            variant = variant_filename(match.group(1), width, extension)
+            if os.path.exists(os.path.join(folder, variant)):
+                candidates.append(f'{UPLOAD_URL_PREFIX}{variant} {width}w')
+        if candidates:
+            srcset[name] = ', '.join(candidates)
+    return srcset
@@ -8,13 +8,28 @@ class WelcomeVideo(db.Model):
     def __repr__(self):
         return f'WelcomeVideo(\'{self.video_url}\')'
 
+class ContentVersion(db.Model):
+    name = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f'ContentVersion(\'{self.name}\', {self.version})'
+
+class Statistic(db.Model):
+    name = db.Column(db.String(50), primary_key=True)
+    value = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f'Statistic(\'{self.name}\', {self.value})'
+
 class User(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
     email = db.Column(db.String(120), unique=True, nullable=False)
     password = db.Column(db.String(60), nullable=False)
-    role = db.Column(db.String(20), default='client') # 'admin' or 'client'
+    role = db.Column(db.String(20), default='client', index=True) # 'admin' or 'client'
     picture = db.Column(db.String(200), nullable=True)
+    token_version = db.Column(db.Integer, nullable=False, default=0)
     levels = db.relationship('UserLevel', backref='user', lazy=True)
 
     def __repr__(self):
@@ -30,7 +45,8 @@ class Level(db.Model):
     price = db.Column(db.Float, nullable=False)
     initial_exam_question = db.Column(db.Text, nullable=True)
     final_exam_question = db.Column(db.Text, nullable=True)
-    videos = db.relationship('Video', backref='level', lazy=True)
+    purchases_count = db.Column(db.Integer, nullable=False, default=0, index=True)
+    videos = db.relationship('Video', backref='level', lazy=True, order_by='Video.id')
     user_levels = db.relationship('UserLevel', backref='level', lazy=True)
 
     def __repr__(self):
@@ -38,14 +54,20 @@ class Level(db.Model):
 
 class Video(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    level_id = db.Column(db.Integer, db.ForeignKey('level.id'), nullable=False)
+    level_id = db.Column(db.Integer, db.ForeignKey('level.id'), nullable=False, index=True)
     youtube_link = db.Column(db.String(200), nullable=False)
     questions = db.Column(db.Text, nullable=True)
+    revision = db.Column(db.Integer, nullable=False, default=0)
 
     def __repr__(self):
         return f'Video(\'{self.youtube_link}\')'
 
 class UserLevel(db.Model):
+    __table_args__ = (
+        db.Index('ix_user_level_user_id_level_id', 'user_id', 'level_id', unique=True),
+        db.Index('ix_user_level_level_id', 'level_id'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     level_id = db.Column(db.Integer, db.ForeignKey('level.id'), nullable=False)
@@ -54,12 +76,22 @@ class UserLevel(db.Model):
     initial_exam_score = db.Column(db.Float, nullable=True)
     final_exam_score = db.Column(db.Float, nullable=True)
     score_difference = db.Column(db.Float, nullable=True)
+    completed_videos_count = db.Column(db.Integer, nullable=False, default=0)
+    total_videos_count = db.Column(db.Integer, nullable=False, default=0)
+    opened_through_video_id = db.Column(db.Integer, nullable=True)
+    opened_bits = db.Column(db.LargeBinary, nullable=True)
+    completed_bits = db.Column(db.LargeBinary, nullable=True)
     videos_progress = db.relationship('UserVideoProgress', backref='user_level', lazy=True)
 
     def __repr__(self):
         return f'UserLevel(User: {self.user_id}, Level: {self.level_id})'
 
 class UserVideoProgress(db.Model):
+    __table_args__ = (
+        db.Index('ix_user_video_progress_user_level_id_video_id', 'user_level_id', 'video_id', unique=True),
+        db.Index('ix_user_video_progress_video_id', 'video_id'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     user_level_id = db.Column(db.Integer, db.ForeignKey('user_level.id'), nullable=False)
     video_id = db.Column(db.Integer, db.ForeignKey('video.id'), nullable=False)
@@ -70,6 +102,12 @@ class UserVideoProgress(db.Model):
         return f'UserVideoProgress(UserLevel: {self.user_level_id}, Video: {self.video_id}, Opened: {self.is_opened}, Completed: {self.is_completed})'
 
 class ExamResult(db.Model):
+    __table_args__ = (
+        db.Index('ix_exam_result_user_id_level_id', 'user_id', 'level_id'),
+        db.Index('ix_exam_result_level_id_timestamp', 'level_id', 'timestamp'),
+        db.Index('ix_exam_result_timestamp', 'timestamp'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     level_id = db.Column(db.Integer, db.ForeignKey('level.id'), nullable=False)
@@ -78,6 +116,21 @@ class ExamResult(db.Model):
     percentage = db.Column(db.Float, nullable=False)
     type = db.Column(db.String(20), nullable=False)
     timestamp = db.Column(db.DateTime, default=datetime.utcnow)
+    user = db.relationship('User')
+    level = db.relationship('Level')
+
+    def __repr__(self):
+        return f'ExamResult(User: {self.user_id}, Level: {self.level_id}, Type: {self.type}, Score: {self.percentage})'
+
+class UserStatistics(db.Model):
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True)
+    purchased_levels = db.Column(db.Integer, nullable=False, default=0)
+    completed_levels = db.Column(db.Integer, nullable=False, default=0)
+    initial_exams_count = db.Column(db.Integer, nullable=False, default=0)
+    initial_score_total = db.Column(db.Float, nullable=False, default=0)
+    final_exams_count = db.Column(db.Integer, nullable=False, default=0)
+    final_score_total = db.Column(db.Float, nullable=False, default=0)
+    user = db.relationship('User', backref=db.backref('statistics', uselist=False, cascade='all, delete-orphan'))
 
     def __repr__(self):
-        return f'ExamResult(User: {self.user_id}, Level: {self.level_id}, Type: {self.type}, Score: {self.percentage})'
\ No newline at end of file
+        return f'UserStatistics(User: {self.user_id})'
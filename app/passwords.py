@@ -0,0 +1,143 @@
+import hashlib
+import hmac
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, TimeoutError
+
+import bcrypt as bcrypt_lib
+
+class PasswordHasherBusy(Exception):
+    pass
+
+def _password_bytes(password, handle_long_passwords):
+    password = password.encode('utf-8') if isinstance(password, str) else password
+    if handle_long_passwords:
+        password = hashlib.sha256(password).hexdigest().encode('utf-8')
+    return password
+
+# Module-level so they can be pickled into pool worker processes. Hashes
+# match Flask-Bcrypt's for the same BCRYPT_* settings, so passwords stored
+# before it was dropped still verify.
+def hash_password(password, rounds, prefix='2b', handle_long_passwords=False):
+    if not password:
+        raise ValueError('Password must be non-empty.')
+    salt = bcrypt_lib.gensalt(rounds=rounds, prefix=prefix.encode('utf-8'))
+    return bcrypt_lib.hashpw(_password_bytes(password, handle_long_passwords), salt).decode('utf-8')
+
+def check_password(pw_hash, password, handle_long_passwords=False):
+    pw_hash = pw_hash.encode('utf-8')
+    return hmac.compare_digest(bcrypt_lib.hashpw(_password_bytes(password, handle_long_passwords), pw_hash), pw_hash)
+
+def hash_cost(pw_hash):
+    try:
+        return int(pw_hash.split('$')[2])
+    except (AttributeError, IndexError, ValueError):
+        return None
+
+def measure_hash_time(rounds, samples=3):
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        hash_password('calibration password', rounds)
+        timings.append((time.perf_counter() - start) * 1000)
+    return min(timings)
+
+# Times one hash at each cost from min_rounds upwards (every step doubles
+# the work) and returns the highest cost within target_ms with the timings.
+def calibrate_rounds(target_ms, min_rounds=4, max_rounds=16):
+    timings = {}
+    for rounds in range(min_rounds, max_rounds + 1):
+        timings[rounds] = measure_hash_time(rounds)
+        if timings[rounds] > target_ms:
+            break
+    within_target = [rounds for rounds, ms in timings.items() if ms <= target_ms]
+    return max(within_target, default=min_rounds), timings
+
+class PasswordHasher:
+    """Runs bcrypt off the request thread in a bounded pool.
+
+    At most PASSWORD_HASH_MAX_PENDING hashes may be queued or running per app
+    process; beyond that PasswordHasherBusy is raised so the request can be
+    answered with 503 instead of piling up. PASSWORD_HASH_WORKERS = 0 hashes
+    inline on the calling thread, still subject to the same limit.
+    """
+
+    def __init__(self):
+        self.rounds = 12
+        self.prefix = '2b'
+        self.handle_long_passwords = False
+        self.workers = 0
+        self.executor_type = 'thread'
+        self.max_pending = 64
+        self.timeout = 10
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._executor = None
+        self._executor_pid = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.shutdown()
+        self.rounds = app.config.get('BCRYPT_LOG_ROUNDS', 12)
+        self.prefix = app.config.get('BCRYPT_HASH_PREFIX', '2b')
+        self.handle_long_passwords = app.config.get('BCRYPT_HANDLE_LONG_PASSWORDS', False)
+        self.workers = app.config.get('PASSWORD_HASH_WORKERS', 0)
+        self.executor_type = app.config.get('PASSWORD_HASH_EXECUTOR', 'thread')
+        self.max_pending = app.config.get('PASSWORD_HASH_MAX_PENDING', 64)
+        self.timeout = app.config.get('PASSWORD_HASH_TIMEOUT', 10)
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        app.extensions['password_hasher'] = self
+
+    # Created on first use, and again after a fork, so pre-forking servers
+    # give every worker process its own pool. bcrypt releases the GIL, so
+    # threads already hash in parallel; 'process' uses spawned interpreters,
+    # which re-import the launching script and need it __main__-guarded.
+    def executor(self):
+        with self._lock:
+            if self._executor is None or self._executor_pid != os.getpid():
+                if self.executor_type == 'thread':
+                    self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix='password-hasher')
+                else:
+                    self._executor = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context('spawn'))
+                self._executor_pid = os.getpid()
+            return self._executor
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None and self._executor_pid == os.getpid():
+                self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def run(self, fn, *args):
+        slots = self._slots
+        if not slots.acquire(blocking=False):
+            raise PasswordHasherBusy()
+
+        if not self.workers:
+            try:
+                return fn(*args)
+            finally:
+                slots.release()
+
+        # The slot is held until the hash finishes, even if the request
+        # stops waiting for it.
+        try:
+            future = self.executor().submit(fn, *args)
+        except Exception:
+            slots.release()
+            raise
+        future.add_done_callback(lambda future: slots.release())
+        try:
+            return future.result(timeout=self.timeout)
+        except TimeoutError:
+            raise PasswordHasherBusy()
+
+    def generate_password_hash(self, password, rounds=None):
+        return self.run(hash_password, password, rounds or self.rounds, self.prefix, self.handle_long_passwords)
+
+    def check_password_hash(self, pw_hash, password):
+        return self.run(check_password, pw_hash, password, self.handle_long_passwords)
+
+    def needs_rehash(self, pw_hash):
+        return hash_cost(pw_hash) != self.rounds
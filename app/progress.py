@@ -0,0 +1,140 @@
+from flask import current_app
+from app import db
+from app.models import Video, UserLevel, UserVideoProgress
+
+# Bitset progress storage: UserLevel.opened_bits/completed_bits hold one bit
+# per video, indexed by the video's position in the level (id order), stored
+# as little-endian bytes.
+
+def bitset_progress():
+    return current_app.config.get('PROGRESS_STORAGE') == 'bitset'
+
+def to_int(bits):
+    return int.from_bytes(bits, 'little') if bits else 0
+
+def to_bits(value):
+    return value.to_bytes((value.bit_length() + 7) // 8, 'little') if value else None
+
+def has_bit(bits, index):
+    return bool(to_int(bits) >> index & 1)
+
+def set_bit(bits, index):
+    return to_bits(to_int(bits) | (1 << index))
+
+def remove_bit(bits, index):
+    value = to_int(bits)
+    low = value & ((1 << index) - 1)
+    return to_bits(low | (value >> (index + 1) << index))
+
+def popcount(bits):
+    return bin(to_int(bits)).count('1')
+
+def video_index(video):
+    return db.session.query(db.func.count(Video.id)).filter(
+        Video.level_id == video.level_id,
+        Video.id < video.id
+    ).scalar()
+
+def complete_video_bits(user_level, video, open_next, attempts=3):
+    index = video_index(video)
+
+    # Compare-and-swap on the old bitsets so concurrent completions of
+    # different videos in the same level cannot overwrite each other.
+    for _ in range(attempts):
+        opened, completed = user_level.opened_bits, user_level.completed_bits
+        new_completed = set_bit(completed, index)
+        new_opened = set_bit(opened, index + 1) if open_next else opened
+        if new_completed == completed and new_opened == opened:
+            return True
+
+        completed_count = popcount(new_completed)
+        updated = UserLevel.query.filter(
+            UserLevel.id == user_level.id,
+            UserLevel.opened_bits.is_not_distinct_from(opened),
+            UserLevel.completed_bits.is_not_distinct_from(completed)
+        ).update({
+            UserLevel.opened_bits: new_opened,
+            UserLevel.completed_bits: new_completed,
+            UserLevel.completed_videos_count: completed_count,
+            UserLevel.can_take_final_exam: db.or_(
+                UserLevel.can_take_final_exam == True,
+                completed_count >= UserLevel.total_videos_count
+            )
+        }, synchronize_session=False)
+        if updated:
+            return True
+        db.session.refresh(user_level)
+
+    return False
+
+def remove_video_bits(video):
+    index = video_index(video)
+    updates = []
+    for user_level in UserLevel.query.filter_by(level_id=video.level_id):
+        completed_count = user_level.completed_videos_count - has_bit(user_level.completed_bits, index)
+        total_count = user_level.total_videos_count - 1
+        updates.append({
+            'id': user_level.id,
+            'opened_bits': remove_bit(user_level.opened_bits, index),
+            'completed_bits': remove_bit(user_level.completed_bits, index),
+            'completed_videos_count': completed_count,
+            'total_videos_count': total_count,
+            'can_take_final_exam': bool(user_level.can_take_final_exam or completed_count >= total_count)
+        })
+    if updates:
+        db.session.execute(db.update(UserLevel), updates)
+
+def convert_progress_storage(layout, chunk_size=500):
+    converted = 0
+    level_videos = {}
+    query = UserLevel.query.order_by(UserLevel.id)
+
+    for start in range(0, query.count(), chunk_size):
+        user_levels = query.offset(start).limit(chunk_size).all()
+        rows = {}
+        for video_progress in UserVideoProgress.query.filter(
+            UserVideoProgress.user_level_id.in_([user_level.id for user_level in user_levels])
+        ):
+            rows[(video_progress.user_level_id, video_progress.video_id)] = video_progress
+
+        for user_level in user_levels:
+            if user_level.level_id not in level_videos:
+                level_videos[user_level.level_id] = [video_id for (video_id,) in db.session.query(Video.id).filter_by(
+                    level_id=user_level.level_id
+                ).order_by(Video.id)]
+            video_ids = level_videos[user_level.level_id]
+
+            if layout == 'bitset':
+                opened = completed = 0
+                for index, video_id in enumerate(video_ids):
+                    video_progress = rows.get((user_level.id, video_id))
+                    pointer = user_level.opened_through_video_id
+                    if (pointer is not None and video_id <= pointer) or (video_progress and video_progress.is_opened):
+                        opened |= 1 << index
+                    if video_progress and video_progress.is_completed:
+                        completed |= 1 << index
+                user_level.opened_bits = to_bits(opened)
+                user_level.completed_bits = to_bits(completed)
+                UserVideoProgress.query.filter_by(user_level_id=user_level.id).delete(synchronize_session=False)
+            else:
+                # The pointer covers the unbroken run of opened videos from
+                # the start; videos opened after a gap get their own rows
+                opened_run = 0
+                while opened_run < len(video_ids) and has_bit(user_level.opened_bits, opened_run):
+                    opened_run += 1
+                user_level.opened_through_video_id = video_ids[opened_run - 1] if opened_run else None
+                for index, video_id in enumerate(video_ids):
+                    is_opened = has_bit(user_level.opened_bits, index)
+                    is_completed = has_bit(user_level.completed_bits, index)
+                    if (is_completed or (is_opened and index >= opened_run)) and (user_level.id, video_id) not in rows:
+                        db.session.add(UserVideoProgress(
+                            user_level_id=user_level.id,
+                            video_id=video_id,
+                            is_opened=is_opened,
+                            is_completed=is_completed
+                        ))
+            converted += 1
+
+        db.session.commit()
+
+    return converted
@@ -0,0 +1,274 @@
+import json
+from sqlalchemy.orm import selectinload
+from app import db, cache
+from app.cache import MemoryBackend
+from app.models import User, Level, Video, UserLevel, UserVideoProgress, ContentVersion
+from app.progress import bitset_progress, has_bit, remove_video_bits
+from app.images import image_srcset
+
+# Parsed questions stay in-process: sharing them through a networked
+# backend would mean decoding JSON again on every read.
+class QuestionCache:
+    def __init__(self, max_size=4096):
+        self.entries = MemoryBackend(max_size)
+
+    def get(self, video):
+        if not video.questions:
+            return []
+
+        # The revision is stored on the row, so an update made by any worker
+        # changes the key and a stale parse is never served.
+        key = (video.id, video.revision)
+        questions = self.entries.get(key)
+        if questions is None:
+            questions = json.loads(video.questions)
+            self.entries.set(key, questions)
+        return questions
+
+    def forget(self, video):
+        self.entries.delete((video.id, video.revision))
+
+question_cache = QuestionCache()
+
+def init_question_cache(app):
+    question_cache.entries = MemoryBackend(app.config.get('QUESTION_CACHE_SIZE', 4096))
+
+def video_questions(video):
+    return question_cache.get(video)
+
+def forget_video_questions(video):
+    question_cache.forget(video)
+
+# Progress is sparse: a UserVideoProgress row exists only once a video has
+# been completed, or opened out of order (see open_video). Videos up to
+# UserLevel.opened_through_video_id (in id order) are unlocked; a missing
+# row means not completed. With PROGRESS_STORAGE = 'bitset' the state is
+# read from UserLevel alone.
+def load_progress(user_level_ids):
+    progress = {}
+    if bitset_progress():
+        return progress
+    for video_progress in UserVideoProgress.query.filter(UserVideoProgress.user_level_id.in_(user_level_ids)):
+        progress[(video_progress.user_level_id, video_progress.video_id)] = video_progress
+    return progress
+
+def video_state(user_level, index, video_id, video_progress):
+    if bitset_progress():
+        return has_bit(user_level.opened_bits, index), has_bit(user_level.completed_bits, index)
+
+    is_opened = user_level.opened_through_video_id is not None and video_id <= user_level.opened_through_video_id
+    if video_progress:
+        return is_opened or video_progress.is_opened, video_progress.is_completed
+    return is_opened, False
+
+def catalog_version():
+    return db.session.query(ContentVersion.version).filter_by(name='catalog').scalar() or 0
+
+def bump_catalog_version():
+    updated = ContentVersion.query.filter_by(name='catalog').update({
+        ContentVersion.version: ContentVersion.version + 1
+    }, synchronize_session=False)
+    if not updated:
+        db.session.add(ContentVersion(name='catalog', version=1))
+
+# Catalog skeletons (levels and videos without any per-user state) are cached
+# in the shared cache under the catalog content version, which every
+# level/video change bumps.
+def load_catalog(query, cache_key):
+    cache_key = 'catalog:' + json.dumps(cache_key)
+    catalog = cache.get(cache_key)
+    if catalog is None:
+        levels = query.options(selectinload(Level.videos)).order_by(Level.name).all()
+        catalog = [{
+            'level': {
+                'id': level.id,
+                'name': level.name,
+                'description': level.description,
+                'welcome_video_url': level.welcome_video_url,
+                'image_path': level.image_path,
+                'image_srcset': image_srcset(level.image_path),
+                'price': level.price,
+                'initial_exam_question': level.initial_exam_question,
+                'final_exam_question': level.final_exam_question,
+                'videos_count': len(level.videos)
+            },
+            'videos': [{
+                'id': video.id,
+                'youtube_link': video.youtube_link,
+                'questions': video_questions(video)
+            } for video in level.videos]
+        } for level in levels]
+        cache.set(cache_key, catalog)
+    return catalog
+
+def load_catalog_progress(level_ids, user_id, with_user_counts=False):
+    user_levels = {}
+    progress = {}
+    user_counts = {}
+
+    if level_ids:
+        for user_level in UserLevel.query.filter(
+            UserLevel.user_id == user_id,
+            UserLevel.level_id.in_(level_ids)
+        ):
+            user_levels[user_level.level_id] = user_level
+
+    if user_levels:
+        progress = load_progress([user_level.id for user_level in user_levels.values()])
+
+    if with_user_counts and level_ids:
+        user_counts = dict(db.session.query(
+            UserLevel.level_id,
+            db.func.count(UserLevel.id)
+        ).filter(UserLevel.level_id.in_(level_ids)).group_by(UserLevel.level_id).all())
+
+    return user_levels, progress, user_counts
+
+def load_user_levels(user_id):
+    user_levels = UserLevel.query.filter_by(user_id=user_id).options(
+        selectinload(UserLevel.level).selectinload(Level.videos)
+    ).order_by(UserLevel.id).all()
+
+    progress = load_progress([user_level.id for user_level in user_levels]) if user_levels else {}
+
+    return user_levels, progress
+
+def serialize_level(entry, user_level, progress, is_admin=False):
+    level_data = dict(entry['level'])
+    level_data.update({
+        'videos': [],
+        'is_completed': False,
+        'can_take_final_exam': False
+    })
+
+    if user_level:
+        level_data['is_completed'] = user_level.is_completed
+        level_data['can_take_final_exam'] = user_level.can_take_final_exam
+
+        for index, video in enumerate(entry['videos']):
+            is_opened, is_completed = video_state(user_level, index, video['id'], progress.get((user_level.id, video['id'])))
+
+            level_data['videos'].append({
+                'id': video['id'],
+                'youtube_link': video['youtube_link'] if is_admin or is_opened else '',
+                'questions': video['questions'] if is_admin or is_opened else [],
+                'is_opened': is_opened
+            })
+    else:
+        level_data['videos'] = [{'id': v['id'], 'youtube_link': '', 'questions': [], 'is_opened': False} for v in entry['videos']]
+
+    return level_data
+
+def paginate_after(query, id_column, limit, after=None):
+    if after is not None:
+        query = query.filter(id_column > after)
+    rows = query.order_by(id_column).limit(limit + 1).all()
+    return rows[:limit], len(rows) > limit
+
+def iter_chunks(query, id_column, chunk_size):
+    chunk = []
+    for row in query.order_by(id_column).yield_per(chunk_size):
+        chunk.append(row)
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def chunked(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+def existing_user_ids(user_ids, chunk_size=500):
+    found = set()
+    for chunk in chunked(user_ids, chunk_size):
+        found.update(user_id for (user_id,) in db.session.query(User.id).filter(User.id.in_(chunk)))
+    return found
+
+# Enrolls users in a level with one bulk INSERT of UserLevel rows. No
+# progress rows are written up front; the first video starts unlocked.
+def enroll_users(level_id, user_ids, chunk_size=500):
+    user_ids = list(dict.fromkeys(user_ids))
+    video_ids = [video_id for (video_id,) in db.session.query(Video.id).filter_by(level_id=level_id).order_by(Video.id)]
+
+    enrolled = set()
+    for chunk in chunked(user_ids, chunk_size):
+        enrolled.update(user_id for (user_id,) in db.session.query(UserLevel.user_id).filter(
+            UserLevel.level_id == level_id,
+            UserLevel.user_id.in_(chunk)
+        ))
+
+    new_user_ids = [user_id for user_id in user_ids if user_id not in enrolled]
+    if not new_user_ids:
+        return []
+
+    db.session.execute(db.insert(UserLevel), [{
+        'user_id': user_id,
+        'level_id': level_id,
+        'is_completed': False,
+        'can_take_final_exam': False,
+        'completed_videos_count': 0,
+        'total_videos_count': len(video_ids),
+        'opened_through_video_id': video_ids[0] if video_ids else None,
+        'opened_bits': b'\x01' if video_ids else None
+    } for user_id in new_user_ids])
+
+    return new_user_ids
+
+# UserLevel keeps completed_videos_count/total_videos_count up to date so
+# progress checks never have to count UserVideoProgress rows.
+def record_video_completed(user_level_id):
+    UserLevel.query.filter_by(id=user_level_id).update({
+        UserLevel.completed_videos_count: UserLevel.completed_videos_count + 1,
+        UserLevel.can_take_final_exam: db.or_(
+            UserLevel.can_take_final_exam == True,
+            UserLevel.completed_videos_count + 1 >= UserLevel.total_videos_count
+        )
+    }, synchronize_session=False)
+
+def record_video_added(level_id):
+    UserLevel.query.filter_by(level_id=level_id).update({
+        UserLevel.total_videos_count: UserLevel.total_videos_count + 1
+    }, synchronize_session=False)
+
+def record_video_removed(video):
+    if bitset_progress():
+        remove_video_bits(video)
+        return
+
+    completed_user_levels = db.select(UserVideoProgress.user_level_id).where(
+        UserVideoProgress.video_id == video.id,
+        UserVideoProgress.is_completed == True
+    )
+    UserLevel.query.filter(UserLevel.id.in_(completed_user_levels)).update({
+        UserLevel.completed_videos_count: UserLevel.completed_videos_count - 1
+    }, synchronize_session=False)
+    UserLevel.query.filter_by(level_id=video.level_id).update({
+        UserLevel.total_videos_count: UserLevel.total_videos_count - 1,
+        UserLevel.can_take_final_exam: db.or_(
+            UserLevel.can_take_final_exam == True,
+            UserLevel.completed_videos_count >= UserLevel.total_videos_count - 1
+        )
+    }, synchronize_session=False)
+
+def record_video_opened(user_level_id, video_id):
+    UserLevel.query.filter(
+        UserLevel.id == user_level_id,
+        db.or_(UserLevel.opened_through_video_id == None, UserLevel.opened_through_video_id < video_id)
+    ).update({UserLevel.opened_through_video_id: video_id}, synchronize_session=False)
+
+# Completing a video that is still locked, which the API has always
+# allowed, opens only the video after it. That opening is kept in a
+# progress row so the pointer does not jump past the videos in between.
+def open_video(user_level_id, video_id):
+    video_progress = UserVideoProgress.query.filter_by(user_level_id=user_level_id, video_id=video_id).first()
+    if video_progress:
+        video_progress.is_opened = True
+    else:
+        db.session.add(UserVideoProgress(user_level_id=user_level_id, video_id=video_id, is_opened=True, is_completed=False))
+
+def next_video_id(level_id, video_id):
+    return db.session.query(Video.id).filter(
+        Video.level_id == level_id,
+        Video.id > video_id
+    ).order_by(Video.id).limit(1).scalar()
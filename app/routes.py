@@ -1,32 +1,98 @@
-from flask import Blueprint, request, jsonify, send_from_directory, current_app
+from flask import Blueprint, request, jsonify, current_app, g, Response, stream_with_context
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from app import db, bcrypt
+from app import db, cache, password_hasher
 from app.models import User, Level, Video, UserLevel, UserVideoProgress, ExamResult, WelcomeVideo
-from app.auth import admin_required, client_required, authenticate_user, create_user_token
+from app.passwords import PasswordHasherBusy
+from app.uploads import store_upload, release_upload, upload_response
+from app.images import schedule_variants
+from app.auth import admin_required, client_required, authenticate_user, create_user_token, load_current_user, invalidate_user, bump_token_version
+from app.progress import bitset_progress, complete_video_bits
+from app.queries import load_catalog, catalog_version, bump_catalog_version, load_catalog_progress, \
+    load_user_levels, load_progress, serialize_level, video_state, enroll_users, existing_user_ids, \
+    paginate_after, iter_chunks, video_questions, forget_video_questions, \
+    record_video_completed, record_video_added, record_video_removed, record_video_opened, open_video, next_video_id
+from app.statistics import admin_statistics, statistics_changed, serialize_user_statistics, users_statistics_query, record_user_registered, \
+    record_role_changed, record_user_deleted, record_level_created, record_level_deleted, record_levels_purchased, \
+    record_level_completed, record_exam_result
 import json
-import os
-import uuid
-from werkzeug.utils import secure_filename
+from werkzeug.exceptions import RequestEntityTooLarge
+from sqlalchemy.orm import selectinload, contains_eager
+from datetime import datetime
 
 bp = Blueprint('main', __name__)
 
+# Password hashing sheds load once its queue is full
+@bp.errorhandler(PasswordHasherBusy)
+def password_hasher_busy(e):
+    response = jsonify({'message': 'Server busy, please try again shortly'})
+    response.headers['Retry-After'] = '1'
+    return response, 503
+
+@bp.errorhandler(RequestEntityTooLarge)
+def request_too_large(e):
+    return jsonify({'message': 'Request too large', 'max_bytes': current_app.config['MAX_CONTENT_LENGTH']}), 413
+
 # Serve uploaded files
 @bp.route('/Uploads/levels/<filename>')
 def serve_uploaded_file(filename):
-    return send_from_directory(current_app.config['UPLOAD_FOLDER'], filename)
+    return upload_response(filename)
 
 # Custom decorator to allow both admin and client roles
 def admin_or_client_required(f):
     @jwt_required()
     def wrapper(*args, **kwargs):
-        current_user_id = int(get_jwt_identity())
-        user = User.query.get(current_user_id)
-        if user.role not in ['admin', 'client']:
+        user = load_current_user()
+        if not user or user.role not in ['admin', 'client']:
             return jsonify({'message': 'Access denied'}), 403
         return f(*args, **kwargs)
     wrapper.__name__ = f.__name__
     return wrapper
 
+# Admin list responses: the whole table by default, one keyset page with
+# ?limit=&after=<id>, or every row streamed in chunks with ?stream=json|ndjson
+def list_response(query, id_column, serialize, order_by=None, cursor_key='id'):
+    limit = request.args.get('limit', type=int)
+    after = request.args.get('after', type=int)
+    stream = request.args.get('stream')
+    
+    if stream in ('json', 'ndjson'):
+        return stream_response(query, id_column, serialize, ndjson=(stream == 'ndjson'))
+    
+    if limit is None and after is None:
+        rows = query.order_by(order_by if order_by is not None else id_column).all()
+        return jsonify([serialize(row) for row in rows]), 200
+    
+    max_page_size = current_app.config['MAX_PAGE_SIZE']
+    limit = max(1, min(limit or max_page_size, max_page_size))
+    rows, has_more = paginate_after(query, id_column, limit, after)
+    items = [serialize(row) for row in rows]
+    
+    response = jsonify(items)
+    if has_more:
+        response.headers['X-Next-After'] = str(items[-1][cursor_key])
+    return response, 200
+
+def stream_response(query, id_column, serialize, ndjson=False):
+    dumps = current_app.json.dumps
+    chunk_size = current_app.config['STREAM_CHUNK_SIZE']
+    
+    def generate():
+        first = True
+        if not ndjson:
+            yield '['
+        for chunk in iter_chunks(query, id_column, chunk_size):
+            items = [dumps(serialize(row)) for row in chunk]
+            if ndjson:
+                yield '\n'.join(items) + '\n'
+            else:
+                yield ('' if first else ',') + ','.join(items)
+            first = False
+        if not ndjson:
+            yield ']'
+    
+    mimetype = 'application/x-ndjson' if ndjson else 'application/json'
+    return Response(stream_with_context(generate()), mimetype=mimetype)
+
 # Welcome Video Management Routes
 @bp.route('/welcome_video', methods=['POST'])
 @admin_required
@@ -66,7 +132,7 @@ def register():
     if User.query.filter_by(email=data['email']).first():
         return jsonify({'message': 'User already exists'}), 400
     
-    hashed_password = bcrypt.generate_password_hash(data['password']).decode('utf-8')
+    hashed_password = password_hasher.generate_password_hash(data['password'])
     
     user = User(
         name=data['name'],
@@ -77,7 +143,9 @@ def register():
     )
     
     db.session.add(user)
+    record_user_registered(user)
     db.session.commit()
+    statistics_changed()
     
     token = create_user_token(user)
     
@@ -115,7 +183,7 @@ def login():
 def get_user(user_id):
     current_user_id = int(get_jwt_identity())
     
-    user = User.query.get(current_user_id)
+    user = g.current_user
     if user.role != 'admin' and current_user_id != user_id:
         return jsonify({'message': 'Access denied'}), 403
     
@@ -134,7 +202,7 @@ def get_user(user_id):
 def update_user(user_id):
     current_user_id = int(get_jwt_identity())
     
-    user = User.query.get(current_user_id)
+    user = g.current_user
     if user.role != 'admin' and current_user_id != user_id:
         return jsonify({'message': 'Access denied'}), 403
     
@@ -145,9 +213,15 @@ def update_user(user_id):
     target_user.picture = data.get('picture', target_user.picture)
     
     if user.role == 'admin':
-        target_user.role = data.get('role', target_user.role)
+        new_role = data.get('role', target_user.role)
+        if new_role != target_user.role:
+            record_role_changed(target_user.role, new_role)
+            target_user.role = new_role
+            bump_token_version(target_user)
     
     db.session.commit()
+    invalidate_user(target_user.id)
+    statistics_changed()
     
     return jsonify({
         'id': target_user.id,
@@ -160,27 +234,35 @@ def update_user(user_id):
 @bp.route('/admin/users', methods=['GET'])
 @admin_required
 def get_all_users():
-    users = User.query.all()
-    result = [{
-        'id': user.id,
-        'name': user.name,
-        'email': user.email,
-        'role': user.role,
-        'picture': user.picture,
-        'level_count': len(user.levels)
-    } for user in users]
-    return jsonify(result), 200
+    level_count = db.select(db.func.count(UserLevel.id)).where(UserLevel.user_id == User.id).scalar_subquery()
+    query = db.session.query(User, level_count)
+    
+    def serialize(row):
+        user, user_level_count = row
+        return {
+            'id': user.id,
+            'name': user.name,
+            'email': user.email,
+            'role': user.role,
+            'picture': user.picture,
+            'level_count': user_level_count
+        }
+    
+    return list_response(query, User.id, serialize)
 
 @bp.route('/admin/users/<int:user_id>', methods=['DELETE'])
 @admin_required
 def delete_user(user_id):
     user = User.query.get_or_404(user_id)
     
+    record_user_deleted(user)
     UserLevel.query.filter_by(user_id=user_id).delete()
     ExamResult.query.filter_by(user_id=user_id).delete()
     
     db.session.delete(user)
     db.session.commit()
+    invalidate_user(user_id)
+    statistics_changed()
     
     return jsonify({'message': 'User deleted successfully'}), 200
 
@@ -194,8 +276,10 @@ def reset_user_password(user_id):
     if not new_password:
         return jsonify({'message': 'New password required'}), 400
     
-    user.password = bcrypt.generate_password_hash(new_password).decode('utf-8')
+    user.password = password_hasher.generate_password_hash(new_password)
+    bump_token_version(user)
     db.session.commit()
+    invalidate_user(user.id)
     
     return jsonify({'message': 'Password reset successfully'}), 200
 
@@ -209,30 +293,37 @@ def assign_level_to_user(user_id, level_id):
     if existing_user_level:
         return jsonify({'message': 'Level already assigned'}), 400
     
-    user_level = UserLevel(
-        user_id=user_id,
-        level_id=level_id,
-        is_completed=False,
-        can_take_final_exam=False
-    )
+    record_levels_purchased(level_id, enroll_users(level_id, [user_id]))
+    db.session.commit()
+    statistics_changed()
     
-    db.session.add(user_level)
-    db.session.flush()
+    return jsonify({'message': 'Level assigned successfully'}), 201
+
+@bp.route('/admin/levels/<int:level_id>/assign', methods=['POST'])
+@admin_required
+def assign_level_to_users(level_id):
+    Level.query.get_or_404(level_id)
+    data = request.get_json()
     
-    level_videos = Video.query.filter_by(level_id=level_id).order_by(Video.id).all()
+    user_ids = data.get('user_ids') if data else None
+    if not isinstance(user_ids, list) or not all(isinstance(user_id, int) for user_id in user_ids):
+        return jsonify({'message': 'user_ids must be a list of user IDs'}), 400
     
-    for i, video in enumerate(level_videos):
-        video_progress = UserVideoProgress(
-            user_level_id=user_level.id,
-            video_id=video.id,
-            is_opened=(i == 0),
-            is_completed=False
-        )
-        db.session.add(video_progress)
+    found_user_ids = existing_user_ids(user_ids)
+    missing_user_ids = [user_id for user_id in user_ids if user_id not in found_user_ids]
+    if missing_user_ids:
+        return jsonify({'message': 'Users not found', 'user_ids': missing_user_ids}), 404
     
+    assigned_user_ids = enroll_users(level_id, user_ids)
+    record_levels_purchased(level_id, assigned_user_ids)
     db.session.commit()
+    statistics_changed()
     
-    return jsonify({'message': 'Level assigned successfully'}), 201
+    return jsonify({
+        'message': 'Level assigned successfully',
+        'assigned_count': len(assigned_user_ids),
+        'already_assigned_count': len(set(user_ids)) - len(assigned_user_ids)
+    }), 201
 
 # Level Management Routes
 @bp.route('/levels', methods=['POST'])
@@ -257,15 +348,14 @@ def create_level():
     )
     
     if file:
-        filename = secure_filename(file.filename)
-        unique_filename = f"{uuid.uuid4()}_{filename}"
-        upload_path = os.path.join(current_app.config['UPLOAD_FOLDER'], unique_filename)
-        os.makedirs(os.path.dirname(upload_path), exist_ok=True)
-        file.save(upload_path)
-        level.image_path = f"/Uploads/levels/{unique_filename}"
+        level.image_path = store_upload(file)
     
     db.session.add(level)
+    record_level_created()
+    bump_catalog_version()
     db.session.commit()
+    statistics_changed()
+    schedule_variants(level.image_path)
     
     return jsonify({
         'id': level.id,
@@ -293,16 +383,17 @@ def update_level(level_id):
     level.initial_exam_question = data.get('initial_exam_question', level.initial_exam_question)
     level.final_exam_question = data.get('final_exam_question', level.final_exam_question)
     
+    old_image_path = level.image_path
     if 'file' in request.files and request.files['file'].filename:
-        file = request.files['file']
-        filename = secure_filename(file.filename)
-        unique_filename = f"{uuid.uuid4()}_{filename}"
-        upload_path = os.path.join(current_app.config['UPLOAD_FOLDER'], unique_filename)
-        os.makedirs(os.path.dirname(upload_path), exist_ok=True)
-        file.save(upload_path)
-        level.image_path = f"/Uploads/levels/{unique_filename}"
+        level.image_path = store_upload(request.files['file'])
     
+    bump_catalog_version()
     db.session.commit()
+    statistics_changed()
+    
+    if level.image_path != old_image_path:
+        release_upload(old_image_path)
+        schedule_variants(level.image_path)
     
     return jsonify({
         'id': level.id,
@@ -314,7 +405,7 @@ def update_level(level_id):
         'initial_exam_question': level.initial_exam_question,
         'final_exam_question': level.final_exam_question,
         'videos_count': len(level.videos),
-        'videos': [{'id': v.id, 'youtube_link': v.youtube_link, 'questions': json.loads(v.questions) if v.questions else []} for v in level.videos]
+        'videos': [{'id': v.id, 'youtube_link': v.youtube_link, 'questions': video_questions(v)} for v in level.videos]
     }), 200
 
 @bp.route('/levels/<int:level_id>', methods=['DELETE'])
@@ -322,14 +413,19 @@ def update_level(level_id):
 def delete_level(level_id):
     level = Level.query.get_or_404(level_id)
     
+    record_level_deleted(level)
     for video in level.videos:
         db.session.delete(video)
     
     for user_level in level.user_levels:
         db.session.delete(user_level)
     
+    image_path = level.image_path
     db.session.delete(level)
+    bump_catalog_version()
     db.session.commit()
+    statistics_changed()
+    release_upload(image_path)
     
     return jsonify({'message': 'Level deleted successfully'}), 200
 
@@ -337,7 +433,7 @@ def delete_level(level_id):
 @admin_or_client_required
 def get_levels():
     current_user_id = int(get_jwt_identity())
-    user = User.query.get(current_user_id)
+    user = g.current_user
     
     min_price = request.args.get('min_price', type=float)
     max_price = request.args.get('max_price', type=float)
@@ -352,52 +448,26 @@ def get_levels():
     if name:
         query = query.filter(Level.name.ilike(f'%{name}%'))
     
-    levels = query.order_by(Level.name).all()
+    is_admin = user.role == 'admin'
+    catalog = load_catalog(query, (catalog_version(), min_price, max_price, name))
+    level_ids = [entry['level']['id'] for entry in catalog]
+    user_levels, progress, user_counts = load_catalog_progress(level_ids, current_user_id, with_user_counts=is_admin)
     result = []
     
-    for level in levels:
-        level_data = {
-            'id': level.id,
-            'name': level.name,
-            'description': level.description,
-            'welcome_video_url': level.welcome_video_url,
-            'image_path': level.image_path,
-            'price': level.price,
-            'initial_exam_question': level.initial_exam_question,
-            'final_exam_question': level.final_exam_question,
-            'videos_count': len(level.videos),
-            'videos': [],
-            'is_completed': False,
-            'can_take_final_exam': False
-        }
+    for entry in catalog:
+        level_id = entry['level']['id']
+        level_data = serialize_level(entry, user_levels.get(level_id), progress, is_admin)
         
-        user_level = UserLevel.query.filter_by(user_id=current_user_id, level_id=level.id).first()
-        if user_level:
-            level_data['is_completed'] = user_level.is_completed
-            level_data['can_take_final_exam'] = user_level.can_take_final_exam
-            
-            for video in level.videos:
-                video_progress = UserVideoProgress.query.filter_by(
-                    user_level_id=user_level.id, 
-                    video_id=video.id
-                ).first()
-                
-                video_data = {
-                    'id': video.id,
-                    'youtube_link': video.youtube_link if user.role == 'admin' else (video.youtube_link if video_progress and video_progress.is_opened else ''),
-                    'questions': json.loads(video.questions) if video.questions and (user.role == 'admin' or (video_progress and video_progress.is_opened)) else [],
-                    'is_opened': video_progress.is_opened if video_progress else False
-                }
-                level_data['videos'].append(video_data)
-        else:
-            level_data['videos'] = [{'id': v.id, 'youtube_link': '', 'questions': [], 'is_opened': False} for v in level.videos]
-        
-        if user.role == 'admin':
-            level_data['user_count'] = len(level.user_levels)
+        if is_admin:
+            level_data['user_count'] = user_counts.get(level_id, 0)
         
         result.append(level_data)
     
-    return jsonify(result), 200
+    response = jsonify(result)
+    response.add_etag()
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
 
 @bp.route('/admin/levels', methods=['GET'])
 @admin_required
@@ -415,25 +485,32 @@ def admin_get_all_levels():
     if name:
         query = query.filter(Level.name.ilike(f'%{name}%'))
     
-    levels = query.order_by(Level.name).all()
-    result = [{
-        'id': level.id,
-        'name': level.name,
-        'description': level.description,
-        'welcome_video_url': level.welcome_video_url,
-        'image_path': level.image_path,
-        'price': level.price,
-        'initial_exam_question': level.initial_exam_question,
-        'final_exam_question': level.final_exam_question,
-        'videos_count': len(level.videos),
-        'videos': [{
-            'id': v.id,
-            'youtube_link': v.youtube_link,
-            'questions': json.loads(v.questions) if v.questions else []
-        } for v in level.videos],
-        'user_count': len(level.user_levels)
-    } for level in levels]
-    return jsonify(result), 200
+    user_count = db.select(db.func.count(UserLevel.id)).where(UserLevel.level_id == Level.id).scalar_subquery()
+    query = query.add_columns(user_count).options(selectinload(Level.videos))
+    
+    def serialize(row):
+        level, level_user_count = row
+        return {
+            'id': level.id,
+            'name': level.name,
+            'description': level.description,
+            'welcome_video_url': level.welcome_video_url,
+            'image_path': level.image_path,
+            'price': level.price,
+            'initial_exam_question': level.initial_exam_question,
+            'final_exam_question': level.final_exam_question,
+            'videos_count': len(level.videos),
+            'videos': [{
+                'id': v.id,
+                'youtube_link': v.youtube_link,
+                'questions': video_questions(v)
+            } for v in level.videos],
+            'user_count': level_user_count
+        }
+    
+    # Unpaginated responses keep their original name order; pages and
+    # streams follow the id cursor
+    return list_response(query, Level.id, serialize, order_by=Level.name)
 
 @bp.route('/levels/<int:level_id>', methods=['GET'])
 @client_required
@@ -461,17 +538,15 @@ def get_level(level_id):
         level_data['is_completed'] = user_level.is_completed
         level_data['can_take_final_exam'] = user_level.can_take_final_exam
         
-        for video in level.videos:
-            video_progress = UserVideoProgress.query.filter_by(
-                user_level_id=user_level.id, 
-                video_id=video.id
-            ).first()
+        progress = load_progress([user_level.id])
+        for index, video in enumerate(level.videos):
+            is_opened, is_completed = video_state(user_level, index, video.id, progress.get((user_level.id, video.id)))
             
             video_data = {
                 'id': video.id,
                 'youtube_link': video.youtube_link,
-                'questions': json.loads(video.questions) if video.questions else [],
-                'is_opened': video_progress.is_opened if video_progress else False
+                'questions': video_questions(video),
+                'is_opened': is_opened
             }
             level_data['videos'].append(video_data)
     else:
@@ -493,12 +568,14 @@ def add_video_to_level(level_id):
     )
     
     db.session.add(video)
+    record_video_added(level_id)
+    bump_catalog_version()
     db.session.commit()
     
     return jsonify({
         'id': video.id,
         'youtube_link': video.youtube_link,
-        'questions': json.loads(video.questions) if video.questions else [],
+        'questions': video_questions(video),
         'is_opened': False
     }), 201
 
@@ -509,26 +586,34 @@ def update_video(video_id):
     data = request.get_json()
     
     video.youtube_link = data.get('youtube_link', video.youtube_link)
-    video.questions = json.dumps(data.get('questions', json.loads(video.questions) if video.questions else []))
+    questions = json.dumps(data.get('questions', video_questions(video)))
+    if questions != video.questions:
+        forget_video_questions(video)
+        video.questions = questions
+        video.revision = Video.revision + 1
     
+    bump_catalog_version()
     db.session.commit()
     
     return jsonify({
         'id': video.id,
         'youtube_link': video.youtube_link,
-        'questions': json.loads(video.questions) if video.questions else []
+        'questions': video_questions(video)
     }), 200
 
 @bp.route('/videos/<int:video_id>', methods=['DELETE'])
 @admin_required
 def delete_video(video_id):
     video = Video.query.get_or_404(video_id)
+    record_video_removed(video)
     
     user_progresses = UserVideoProgress.query.filter_by(video_id=video_id).all()
     for progress in user_progresses:
         db.session.delete(progress)
     
+    forget_video_questions(video)
     db.session.delete(video)
+    bump_catalog_version()
     db.session.commit()
     
     return jsonify({'message': 'Video deleted successfully'}), 200
@@ -536,23 +621,28 @@ def delete_video(video_id):
 @bp.route('/admin/videos', methods=['GET'])
 @admin_required
 def get_all_videos():
-    videos = Video.query.all()
-    result = [{
-        'id': video.id,
-        'level_id': video.level_id,
-        'level_name': video.level.name if video.level else '',
-        'youtube_link': video.youtube_link,
-        'questions': json.loads(video.questions) if video.questions else [],
-        'user_progress_count': UserVideoProgress.query.filter_by(video_id=video.id).count()
-    } for video in videos]
-    return jsonify(result), 200
+    progress_count = db.select(db.func.count(UserLevel.id)).where(UserLevel.level_id == Video.level_id).scalar_subquery()
+    query = db.session.query(Video, Level.name, progress_count).outerjoin(Level, Video.level_id == Level.id)
+    
+    def serialize(row):
+        video, level_name, user_progress_count = row
+        return {
+            'id': video.id,
+            'level_id': video.level_id,
+            'level_name': level_name or '',
+            'youtube_link': video.youtube_link,
+            'questions': video_questions(video),
+            'user_progress_count': user_progress_count
+        }
+    
+    return list_response(query, Video.id, serialize)
 
 @bp.route('/users/<int:user_id>/levels/<int:level_id>/videos/<int:video_id>/complete', methods=['PATCH'])
 @client_required
 def complete_video(user_id, level_id, video_id):
     current_user_id = int(get_jwt_identity())
     
-    user = User.query.get(current_user_id)
+    user = g.current_user
     if user.role != 'admin' and current_user_id != user_id:
         return jsonify({'message': 'Access denied'}), 403
     
@@ -560,44 +650,41 @@ def complete_video(user_id, level_id, video_id):
     if not user_level:
         return jsonify({'message': 'Level not purchased'}), 400
     
+    video = Video.query.filter_by(id=video_id, level_id=level_id).first()
+    if not video:
+        return jsonify({'message': 'Video not accessible'}), 400
+    
+    next_id = next_video_id(level_id, video_id)
+    
+    if bitset_progress():
+        if not complete_video_bits(user_level, video, open_next=next_id is not None):
+            db.session.rollback()
+            return jsonify({'message': 'Progress update conflict, please retry'}), 409
+        db.session.commit()
+        return jsonify({'message': 'Video completed successfully'}), 200
+    
     video_progress = UserVideoProgress.query.filter_by(
         user_level_id=user_level.id, 
         video_id=video_id
     ).first()
+    unlocked, _ = video_state(user_level, None, video.id, None)
     
     if not video_progress:
-        return jsonify({'message': 'Video not accessible'}), 400
-    
-    video_progress.is_completed = True
-    
-    level_videos = Video.query.filter_by(level_id=level_id).order_by(Video.id).all()
-    
-    current_video_index = None
-    for i, video in enumerate(level_videos):
-        if video.id == video_id:
-            current_video_index = i
-            break
-    
-    if current_video_index is not None and (current_video_index + 1) < len(level_videos):
-        next_video = level_videos[current_video_index + 1]
-        next_video_progress = UserVideoProgress.query.filter_by(
-            user_level_id=user_level.id, 
-            video_id=next_video.id
-        ).first()
-        
-        if next_video_progress:
-            next_video_progress.is_opened = True
-    
-    all_videos_completed = all(
-        UserVideoProgress.query.filter_by(
-            user_level_id=user_level.id, 
-            video_id=video.id
-        ).first().is_completed
-        for video in level_videos
-    )
-    
-    if all_videos_completed:
-        user_level.can_take_final_exam = True
+        db.session.add(UserVideoProgress(
+            user_level_id=user_level.id,
+            video_id=video_id,
+            is_opened=unlocked,
+            is_completed=True
+        ))
+        record_video_completed(user_level.id)
+    elif not video_progress.is_completed:
+        video_progress.is_completed = True
+        record_video_completed(user_level.id)
+    
+    if next_id is not None and unlocked:
+        record_video_opened(user_level.id, next_id)
+    elif next_id is not None:
+        open_video(user_level.id, next_id)
     
     db.session.commit()
     
@@ -629,6 +716,7 @@ def submit_initial_exam(level_id):
     user_level.initial_exam_score = percentage
     
     db.session.add(exam_result)
+    record_exam_result(exam_result)
     db.session.commit()
     
     return jsonify({
@@ -669,10 +757,13 @@ def submit_final_exam(level_id):
     if user_level.initial_exam_score is not None:
         user_level.score_difference = percentage - user_level.initial_exam_score
     
+    record_level_completed(user_level)
     user_level.is_completed = True
     
     db.session.add(exam_result)
+    record_exam_result(exam_result)
     db.session.commit()
+    statistics_changed()
     
     return jsonify({
         'user_id': current_user_id,
@@ -688,7 +779,7 @@ def submit_final_exam(level_id):
 def get_user_exam_results(level_id, user_id):
     current_user_id = int(get_jwt_identity())
     
-    user = User.query.get(current_user_id)
+    user = g.current_user
     if user.role != 'admin' and current_user_id != user_id:
         return jsonify({'message': 'Access denied'}), 403
     
@@ -709,20 +800,48 @@ def get_user_exam_results(level_id, user_id):
 @bp.route('/admin/exams', methods=['GET'])
 @admin_required
 def get_all_exam_results():
-    exam_results = ExamResult.query.all()
-    result = [{
-        'id': exam.id,
-        'user_id': exam.user_id,
-        'user_name': exam.user.name if exam.user else '',
-        'level_id': exam.level_id,
-        'level_name': exam.level.name if exam.level else '',
-        'correct_words': exam.correct_words,
-        'wrong_words': exam.wrong_words,
-        'percentage': exam.percentage,
-        'type': exam.type,
-        'timestamp': exam.timestamp.isoformat()
-    } for exam in exam_results]
-    return jsonify(result), 200
+    query = ExamResult.query \
+        .outerjoin(ExamResult.user) \
+        .outerjoin(ExamResult.level) \
+        .options(contains_eager(ExamResult.user), contains_eager(ExamResult.level))
+    
+    level_id = request.args.get('level_id', type=int)
+    if level_id is not None:
+        query = query.filter(ExamResult.level_id == level_id)
+    
+    user_id = request.args.get('user_id', type=int)
+    if user_id is not None:
+        query = query.filter(ExamResult.user_id == user_id)
+    
+    exam_type = request.args.get('type')
+    if exam_type:
+        query = query.filter(ExamResult.type == exam_type)
+    
+    try:
+        start = request.args.get('start')
+        if start:
+            query = query.filter(ExamResult.timestamp >= datetime.fromisoformat(start))
+        end = request.args.get('end')
+        if end:
+            query = query.filter(ExamResult.timestamp < datetime.fromisoformat(end))
+    except ValueError:
+        return jsonify({'message': 'start and end must be ISO 8601 dates'}), 400
+    
+    def serialize(exam):
+        return {
+            'id': exam.id,
+            'user_id': exam.user_id,
+            'user_name': exam.user.name if exam.user else '',
+            'level_id': exam.level_id,
+            'level_name': exam.level.name if exam.level else '',
+            'correct_words': exam.correct_words,
+            'wrong_words': exam.wrong_words,
+            'percentage': exam.percentage,
+            'type': exam.type,
+            'timestamp': exam.timestamp.isoformat()
+        }
+    
+    return list_response(query, ExamResult.id, serialize)
 
 # User Progress Routes
 @bp.route('/users/<int:user_id>/levels', methods=['GET'])
@@ -730,46 +849,31 @@ def get_all_exam_results():
 def get_user_levels(user_id):
     current_user_id = int(get_jwt_identity())
     
-    user = User.query.get(current_user_id)
+    user = g.current_user
     if user.role != 'admin' and current_user_id != user_id:
         return jsonify({'message': 'Access denied'}), 403
     
-    user_levels = UserLevel.query.filter_by(user_id=user_id).all()
+    user_levels, progress = load_user_levels(user_id)
     
     result = []
     for user_level in user_levels:
         level = user_level.level
         
         videos_progress = []
-        completed_videos_count = 0
-        
-        for video in level.videos:
-            video_progress = UserVideoProgress.query.filter_by(
-                user_level_id=user_level.id, 
-                video_id=video.id
-            ).first()
-            
-            if video_progress:
-                videos_progress.append({
-                    'video_id': video.id,
-                    'is_opened': video_progress.is_opened,
-                    'is_completed': video_progress.is_completed
-                })
-                if video_progress.is_completed:
-                    completed_videos_count += 1
-            else:
-                videos_progress.append({
-                    'video_id': video.id,
-                    'is_opened': False,
-                    'is_completed': False
-                })
+        for index, video in enumerate(level.videos):
+            is_opened, is_completed = video_state(user_level, index, video.id, progress.get((user_level.id, video.id)))
+            videos_progress.append({
+                'video_id': video.id,
+                'is_opened': is_opened,
+                'is_completed': is_completed
+            })
         
         level_data = {
             'user_id': user_id,
             'level_id': level.id,
             'level_name': level.name,
-            'completed_videos_count': completed_videos_count,
-            'total_videos_count': len(level.videos),
+            'completed_videos_count': user_level.completed_videos_count,
+            'total_videos_count': user_level.total_videos_count,
             'videos_progress': videos_progress,
             'is_completed': user_level.is_completed,
             'can_take_final_exam': user_level.can_take_final_exam,
@@ -787,7 +891,7 @@ def get_user_levels(user_id):
 def purchase_level(user_id, level_id):
     current_user_id = int(get_jwt_identity())
     
-    user = User.query.get(current_user_id)
+    user = g.current_user
     if user.role != 'admin' and current_user_id != user_id:
         return jsonify({'message': 'Access denied'}), 403
     
@@ -797,28 +901,9 @@ def purchase_level(user_id, level_id):
     if existing_user_level:
         return jsonify({'message': 'Level already purchased'}), 400
     
-    user_level = UserLevel(
-        user_id=user_id,
-        level_id=level_id,
-        is_completed=False,
-        can_take_final_exam=False
-    )
-    
-    db.session.add(user_level)
-    db.session.flush()
-    
-    level_videos = Video.query.filter_by(level_id=level_id).order_by(Video.id).all()
-    
-    for i, video in enumerate(level_videos):
-        video_progress = UserVideoProgress(
-            user_level_id=user_level.id,
-            video_id=video.id,
-            is_opened=(i == 0),
-            is_completed=False
-        )
-        db.session.add(video_progress)
-    
+    record_levels_purchased(level_id, enroll_users(level_id, [user_id]))
     db.session.commit()
+    statistics_changed()
     
     return jsonify({'message': 'Level purchased successfully'}), 201
 
@@ -827,7 +912,7 @@ def purchase_level(user_id, level_id):
 def update_level_progress(user_id, level_id):
     current_user_id = int(get_jwt_identity())
     
-    user = User.query.get(current_user_id)
+    user = g.current_user
     if user.role != 'admin' and current_user_id != user_id:
         return jsonify({'message': 'Access denied'}), 403
     
@@ -835,12 +920,8 @@ def update_level_progress(user_id, level_id):
     if not user_level:
         return jsonify({'message': 'Level not purchased'}), 400
     
-    completed_videos = UserVideoProgress.query.filter_by(
-        user_level_id=user_level.id,
-        is_completed=True
-    ).count()
-    
-    total_videos = Video.query.filter_by(level_id=level_id).count()
+    completed_videos = user_level.completed_videos_count
+    total_videos = user_level.total_videos_count
     
     if completed_videos == total_videos:
         user_level.can_take_final_exam = True
@@ -857,52 +938,32 @@ def update_level_progress(user_id, level_id):
 @bp.route('/admin/statistics', methods=['GET'])
 @admin_required
 def get_admin_statistics():
-    total_users = User.query.filter_by(role='client').count()
-    total_levels = Level.query.count()
-    total_purchases = UserLevel.query.count()
-    completed_levels = UserLevel.query.filter_by(is_completed=True).count()
-    
-    completion_rate = (completed_levels / total_purchases * 100) if total_purchases > 0 else 0
-    
-    popular_levels = db.session.query(
-        Level.name,
-        db.func.count(UserLevel.id).label('purchases')
-    ).join(UserLevel).group_by(Level.id).order_by(db.desc('purchases')).limit(5).all()
-    
-    return jsonify({
-        'total_users': total_users,
-        'total_levels': total_levels,
-        'total_purchases': total_purchases,
-        'completed_levels': completed_levels,
-        'completion_rate': round(completion_rate, 2),
-        'popular_levels': [{'name': level, 'purchases': purchases} for level, purchases in popular_levels]
-    }), 200
+    return jsonify(admin_statistics()), 200
+
+@bp.route('/admin/cache/stats', methods=['GET'])
+@admin_required
+def get_cache_statistics():
+    return jsonify(cache.stats()), 200
 
 @bp.route('/admin/users/<int:user_id>/statistics', methods=['GET'])
 @admin_required
 def get_user_statistics(user_id):
     user = User.query.get_or_404(user_id)
     
-    purchased_levels = UserLevel.query.filter_by(user_id=user_id).count()
-    completed_levels = UserLevel.query.filter_by(user_id=user_id, is_completed=True).count()
-    
-    exam_results = ExamResult.query.filter_by(user_id=user_id).all()
+    return jsonify(serialize_user_statistics(user, user.statistics)), 200
+
+@bp.route('/admin/users/statistics', methods=['GET'])
+@admin_required
+def get_users_statistics():
+    user_ids = request.args.get('user_ids')
+    level_id = request.args.get('level_id', type=int)
     
-    initial_scores = [exam.percentage for exam in exam_results if exam.type == 'initial']
-    final_scores = [exam.percentage for exam in exam_results if exam.type == 'final']
+    if user_ids is not None:
+        try:
+            user_ids = [int(user_id) for user_id in user_ids.split(',') if user_id.strip()]
+        except ValueError:
+            return jsonify({'message': 'user_ids must be a comma-separated list of user IDs'}), 400
     
-    avg_initial_score = sum(initial_scores) / len(initial_scores) if initial_scores else 0
-    avg_final_score = sum(final_scores) / len(final_scores) if final_scores else 0
-    avg_improvement = avg_final_score - avg_initial_score if initial_scores and final_scores else 0
+    query = users_statistics_query(user_ids, level_id)
     
-    return jsonify({
-        'user_id': user_id,
-        'user_name': user.name,
-        'purchased_levels': purchased_levels,
-        'completed_levels': completed_levels,
-        'completion_rate': round((completed_levels / purchased_levels * 100) if purchased_levels > 0 else 0, 2),
-        'average_initial_score': round(avg_initial_score, 2),
-        'average_final_score': round(avg_final_score, 2),
-        'average_improvement': round(avg_improvement, 2),
-        'total_exams_taken': len(exam_results)
-    }), 200
\ No newline at end of file
+    return list_response(query, User.id, lambda row: serialize_user_statistics(*row), cursor_key='user_id')
\ No newline at end of file
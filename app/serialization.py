@@ -0,0 +1,51 @@
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask's JSON provider with orjson (pip install orjson) doing the work.
+
+    Output matches the default provider with sorted keys, except that
+    non-ASCII text is sent as UTF-8 instead of \\u escapes. Dates,
+    dataclasses and other extra types still go through Flask's default
+    handler, and calls with json.dumps keyword arguments (such as indent)
+    fall back to the standard library.
+    """
+
+    ensure_ascii = False
+
+    def options(self):
+        options = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+        if self.sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        return options
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=self.options()).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            return super().response(*args, **kwargs)
+
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=self.default, option=self.options() | orjson.OPT_APPEND_NEWLINE),
+            mimetype=self.mimetype
+        )
+
+# JSON_PROVIDER = 'orjson' uses OrjsonProvider when orjson is installed and
+# Flask's default provider otherwise; 'stdlib' always uses the default.
+def json_provider(app):
+    if app.config.get('JSON_PROVIDER', 'orjson') == 'orjson' and orjson is not None:
+        return OrjsonProvider(app)
+    return DefaultJSONProvider(app)
@@ -0,0 +1,237 @@
+from app import db, cache
+from app.models import User, Level, UserLevel, ExamResult, Statistic, UserStatistics
+from app.queries import chunked
+
+# Admin and per-user statistics are read from rollups: Statistic counters,
+# Level.purchases_count and one UserStatistics row per user. The record_*
+# helpers adjust them with SQL expressions inside the transaction making the
+# change; rebuild_statistics() recomputes everything from the source tables.
+TOTALS = ('total_users', 'total_levels', 'total_purchases', 'completed_levels')
+
+USER_STATISTICS_COLUMNS = (
+    'purchased_levels', 'completed_levels',
+    'initial_exams_count', 'initial_score_total',
+    'final_exams_count', 'final_score_total'
+)
+
+def add_statistic(name, amount=1):
+    if not amount:
+        return
+    updated = Statistic.query.filter_by(name=name).update({
+        Statistic.value: Statistic.value + amount
+    }, synchronize_session=False)
+    if not updated:
+        db.session.add(Statistic(name=name, value=amount))
+
+def add_user_statistics(user_ids, chunk_size=500, **amounts):
+    for chunk in chunked(list(user_ids), chunk_size):
+        updated = UserStatistics.query.filter(UserStatistics.user_id.in_(chunk)).update({
+            getattr(UserStatistics, name): getattr(UserStatistics, name) + amount
+            for name, amount in amounts.items()
+        }, synchronize_session=False)
+        if updated < len(chunk):
+            existing = {user_id for (user_id,) in db.session.query(UserStatistics.user_id).filter(UserStatistics.user_id.in_(chunk))}
+            db.session.execute(db.insert(UserStatistics), [
+                dict(amounts, user_id=user_id) for user_id in chunk if user_id not in existing
+            ])
+
+def enrollment_counts(*criteria):
+    purchases, completed = db.session.query(
+        db.func.count(UserLevel.id),
+        db.func.sum(db.case((UserLevel.is_completed == True, 1), else_=0))
+    ).filter(*criteria).one()
+    return purchases, completed or 0
+
+def record_user_registered(user):
+    user.statistics = UserStatistics(**dict.fromkeys(USER_STATISTICS_COLUMNS, 0))
+    if user.role == 'client':
+        add_statistic('total_users')
+
+def record_role_changed(old_role, new_role):
+    if old_role == 'client' and new_role != 'client':
+        add_statistic('total_users', -1)
+    elif old_role != 'client' and new_role == 'client':
+        add_statistic('total_users')
+
+# Must run before the user's UserLevel rows are deleted.
+def record_user_deleted(user):
+    purchases, completed = enrollment_counts(UserLevel.user_id == user.id)
+    Level.query.filter(Level.id.in_(
+        db.select(UserLevel.level_id).where(UserLevel.user_id == user.id)
+    )).update({Level.purchases_count: Level.purchases_count - 1}, synchronize_session=False)
+
+    add_statistic('total_purchases', -purchases)
+    add_statistic('completed_levels', -completed)
+    if user.role == 'client':
+        add_statistic('total_users', -1)
+
+def record_level_created():
+    add_statistic('total_levels')
+
+# Must run before the level's UserLevel rows are deleted.
+def record_level_deleted(level):
+    purchases, completed = enrollment_counts(UserLevel.level_id == level.id)
+    enrolled = db.select(UserLevel.user_id).where(UserLevel.level_id == level.id)
+
+    UserStatistics.query.filter(UserStatistics.user_id.in_(enrolled)).update({
+        UserStatistics.purchased_levels: UserStatistics.purchased_levels - 1
+    }, synchronize_session=False)
+    UserStatistics.query.filter(UserStatistics.user_id.in_(enrolled.where(UserLevel.is_completed == True))).update({
+        UserStatistics.completed_levels: UserStatistics.completed_levels - 1
+    }, synchronize_session=False)
+
+    add_statistic('total_levels', -1)
+    add_statistic('total_purchases', -purchases)
+    add_statistic('completed_levels', -completed)
+
+def record_levels_purchased(level_id, user_ids):
+    if not user_ids:
+        return
+    Level.query.filter_by(id=level_id).update({
+        Level.purchases_count: Level.purchases_count + len(user_ids)
+    }, synchronize_session=False)
+    add_statistic('total_purchases', len(user_ids))
+    add_user_statistics(user_ids, purchased_levels=1)
+
+# Must run before user_level.is_completed is set.
+def record_level_completed(user_level):
+    if user_level.is_completed:
+        return
+    add_statistic('completed_levels')
+    add_user_statistics([user_level.user_id], completed_levels=1)
+
+def record_exam_result(exam_result):
+    add_user_statistics([exam_result.user_id], **{
+        f'{exam_result.type}_exams_count': 1,
+        f'{exam_result.type}_score_total': exam_result.percentage
+    })
+
+# Only cached in a shared backend: statistics_changed() bumps the tag in the
+# backend of the worker that made the change, which the memory backend of
+# other workers would never see.
+@cache.memoize(tags=('statistics',), shared=True)
+def admin_statistics():
+    totals = dict(db.session.query(Statistic.name, Statistic.value).filter(Statistic.name.in_(TOTALS)))
+    total_purchases = totals.get('total_purchases', 0)
+    completed_levels = totals.get('completed_levels', 0)
+
+    completion_rate = (completed_levels / total_purchases * 100) if total_purchases > 0 else 0
+
+    popular_levels = db.session.query(Level.name, Level.purchases_count).filter(
+        Level.purchases_count > 0
+    ).order_by(Level.purchases_count.desc(), Level.id).limit(5).all()
+
+    return {
+        'total_users': totals.get('total_users', 0),
+        'total_levels': totals.get('total_levels', 0),
+        'total_purchases': total_purchases,
+        'completed_levels': completed_levels,
+        'completion_rate': round(completion_rate, 2),
+        'popular_levels': [{'name': level, 'purchases': purchases} for level, purchases in popular_levels]
+    }
+
+def statistics_changed():
+    cache.invalidate_tags('statistics')
+
+def serialize_user_statistics(user, statistics):
+    if statistics is None:
+        statistics = UserStatistics(**dict.fromkeys(USER_STATISTICS_COLUMNS, 0))
+
+    purchased_levels = statistics.purchased_levels
+    completed_levels = statistics.completed_levels
+
+    avg_initial_score = statistics.initial_score_total / statistics.initial_exams_count if statistics.initial_exams_count else 0
+    avg_final_score = statistics.final_score_total / statistics.final_exams_count if statistics.final_exams_count else 0
+    avg_improvement = avg_final_score - avg_initial_score if statistics.initial_exams_count and statistics.final_exams_count else 0
+
+    return {
+        'user_id': user.id,
+        'user_name': user.name,
+        'purchased_levels': purchased_levels,
+        'completed_levels': completed_levels,
+        'completion_rate': round((completed_levels / purchased_levels * 100) if purchased_levels > 0 else 0, 2),
+        'average_initial_score': round(avg_initial_score, 2),
+        'average_final_score': round(avg_final_score, 2),
+        'average_improvement': round(avg_improvement, 2),
+        'total_exams_taken': statistics.initial_exams_count + statistics.final_exams_count
+    }
+
+# One row per user with its rollup (None if the user has none yet), for a
+# list of users, every user enrolled in a level, or everyone.
+def users_statistics_query(user_ids=None, level_id=None):
+    query = db.session.query(User, UserStatistics).outerjoin(UserStatistics, UserStatistics.user_id == User.id)
+    if user_ids is not None:
+        query = query.filter(User.id.in_(user_ids))
+    if level_id is not None:
+        query = query.filter(User.id.in_(db.select(UserLevel.user_id).where(UserLevel.level_id == level_id)))
+    return query
+
+def compute_statistics():
+    totals = {
+        'total_users': User.query.filter_by(role='client').count(),
+        'total_levels': Level.query.count(),
+        'total_purchases': UserLevel.query.count(),
+        'completed_levels': UserLevel.query.filter_by(is_completed=True).count()
+    }
+
+    level_purchases = dict(db.session.query(
+        Level.id,
+        db.func.count(UserLevel.id)
+    ).outerjoin(UserLevel).group_by(Level.id))
+
+    users = {user_id: dict.fromkeys(USER_STATISTICS_COLUMNS, 0) for (user_id,) in db.session.query(User.id)}
+    for user_id, purchased, completed in db.session.query(
+        UserLevel.user_id,
+        db.func.count(UserLevel.id),
+        db.func.sum(db.case((UserLevel.is_completed == True, 1), else_=0))
+    ).group_by(UserLevel.user_id):
+        if user_id in users:
+            users[user_id].update(purchased_levels=purchased, completed_levels=completed or 0)
+    for user_id, exam_type, count, total in db.session.query(
+        ExamResult.user_id,
+        ExamResult.type,
+        db.func.count(ExamResult.id),
+        db.func.sum(ExamResult.percentage)
+    ).group_by(ExamResult.user_id, ExamResult.type):
+        if user_id in users and exam_type in ('initial', 'final'):
+            users[user_id].update({f'{exam_type}_exams_count': count, f'{exam_type}_score_total': total or 0})
+
+    return totals, level_purchases, users
+
+# Recomputes every rollup from the source tables and returns a description
+# of each stored value that had drifted.
+def rebuild_statistics():
+    totals, level_purchases, users = compute_statistics()
+    drift = []
+
+    stored_totals = dict(db.session.query(Statistic.name, Statistic.value).filter(Statistic.name.in_(TOTALS)))
+    for name, value in totals.items():
+        # add_statistic() creates a counter on its first change, so a
+        # missing row stands for 0
+        if stored_totals.get(name, 0) != value:
+            drift.append(f'{name}: {stored_totals.get(name, 0)} -> {value}')
+            Statistic.query.filter_by(name=name).delete(synchronize_session=False)
+            db.session.add(Statistic(name=name, value=value))
+
+    for level_id, purchases_count in db.session.query(Level.id, Level.purchases_count):
+        if purchases_count != level_purchases[level_id]:
+            drift.append(f'level {level_id} purchases_count: {purchases_count} -> {level_purchases[level_id]}')
+            Level.query.filter_by(id=level_id).update({Level.purchases_count: level_purchases[level_id]}, synchronize_session=False)
+
+    for statistics in UserStatistics.query:
+        expected = users.pop(statistics.user_id, None)
+        if expected is None:
+            drift.append(f'user {statistics.user_id}: orphaned statistics row')
+            db.session.delete(statistics)
+            continue
+        for name, value in expected.items():
+            if abs(getattr(statistics, name) - value) > 1e-6:
+                drift.append(f'user {statistics.user_id} {name}: {getattr(statistics, name)} -> {value}')
+                setattr(statistics, name, value)
+    for user_id, expected in users.items():
+        drift.append(f'user {user_id}: missing statistics row')
+        db.session.add(UserStatistics(user_id=user_id, **expected))
+
+    db.session.commit()
+    statistics_changed()
+    return drift
@@ -0,0 +1,246 @@
+import hashlib
+import mimetypes
+import os
+import re
+import shutil
+import tempfile
+import time
+
+from flask import Request, current_app, send_from_directory
+from werkzeug.exceptions import NotFound
+from werkzeug.security import safe_join
+from werkzeug.utils import secure_filename
+
+from app import db
+from app.models import Level
+
+UPLOAD_URL_PREFIX = '/Uploads/levels/'
+
+# Stored uploads are named after the SHA-256 of their content, so a name
+# always refers to the same bytes and can be cached forever; resized
+# variants add -w<width> to the hash of their original. Files saved before
+# that (uuid4()_filename) are served with revalidation only.
+CONTENT_ADDRESSED_NAME = re.compile(r'^([0-9a-f]{64})(-w\d+)?(\.[a-z0-9]+)?$')
+
+def upload_extension(filename):
+    _, extension = os.path.splitext(secure_filename(filename or ''))
+    return extension.lower()
+
+def variant_filename(digest, width, extension):
+    return f'{digest}-w{width}{extension}'
+
+def upload_filename(image_path):
+    if image_path and image_path.startswith(UPLOAD_URL_PREFIX):
+        return image_path[len(UPLOAD_URL_PREFIX):]
+    return None
+
+# Werkzeug writes each multipart file part into the stream returned by
+# Request._get_file_stream as it parses the body. UploadStream writes those
+# chunks straight to a temporary file beside the stored uploads and hashes
+# them on the way, so an upload is never held in memory and store_upload
+# only has to rename it into place.
+class UploadStream:
+    def __init__(self, folder):
+        os.makedirs(folder, exist_ok=True)
+        fd, self.path = tempfile.mkstemp(prefix='.upload-', suffix='.tmp', dir=folder)
+        self.file = os.fdopen(fd, 'w+b')
+        self.sha256 = hashlib.sha256()
+
+    def write(self, data):
+        self.sha256.update(data)
+        return self.file.write(data)
+
+    def __getattr__(self, name):
+        return getattr(self.file, name)
+
+    def __iter__(self):
+        return iter(self.file)
+
+    def store(self, upload_path):
+        self.file.flush()
+        os.chmod(self.path, 0o644)
+        os.replace(self.path, upload_path)
+        self.path = None
+
+    # Removes the temporary file unless store() moved it
+    def close(self):
+        self.file.close()
+        if self.path is not None:
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+            self.path = None
+
+class UploadRequest(Request):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.upload_streams = []
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        stream = UploadStream(current_app.config['UPLOAD_FOLDER'])
+        self.upload_streams.append(stream)
+        return stream
+
+    # Also closes streams of a body that failed to parse (e.g. one cut off
+    # at MAX_CONTENT_LENGTH), which never reach request.files.
+    def close(self):
+        super().close()
+        for stream in self.upload_streams:
+            stream.close()
+
+def hash_file(file, chunk_size):
+    digest = hashlib.sha256()
+    for chunk in iter(lambda: file.read(chunk_size), b''):
+        digest.update(chunk)
+    return digest.hexdigest()
+
+# Identical uploads share one file. Reusing an existing file refreshes its
+# modification time so a concurrent release or garbage collection, which
+# both skip recently touched files, cannot delete it before the new
+# reference is committed.
+def store_upload(file):
+    stream = file.stream
+    chunk_size = current_app.config.get('UPLOAD_CHUNK_SIZE', 65536)
+    if isinstance(stream, UploadStream):
+        digest = stream.sha256.hexdigest()
+    else:
+        digest = hash_file(stream, chunk_size)
+
+    filename = digest + upload_extension(file.filename)
+    upload_path = os.path.join(current_app.config['UPLOAD_FOLDER'], filename)
+    if os.path.exists(upload_path):
+        os.utime(upload_path)
+    elif isinstance(stream, UploadStream):
+        stream.store(upload_path)
+    else:
+        # Written under a temporary name and renamed so readers never see a
+        # partial file
+        os.makedirs(os.path.dirname(upload_path), exist_ok=True)
+        stream.seek(0)
+        fd, temp_path = tempfile.mkstemp(prefix='.upload-', suffix='.tmp', dir=os.path.dirname(upload_path))
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                shutil.copyfileobj(stream, f, chunk_size)
+            os.chmod(temp_path, 0o644)
+            os.replace(temp_path, upload_path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+    return UPLOAD_URL_PREFIX + filename
+
+# Level.image_path is the only reference to an upload, so a file's reference
+# count is the number of levels pointing at it.
+def upload_references(image_path):
+    return Level.query.filter_by(image_path=image_path).count()
+
+def recently_stored(path):
+    return os.path.getmtime(path) > time.time() - current_app.config.get('UPLOAD_GC_GRACE', 3600)
+
+# Deletes an upload once no level refers to it. Call after committing the
+# change that dropped the reference; files stored within UPLOAD_GC_GRACE are
+# left for collect_upload_garbage().
+def release_upload(image_path):
+    filename = upload_filename(image_path)
+    if filename is None or upload_references(image_path):
+        return False
+    folder = current_app.config['UPLOAD_FOLDER']
+    path = safe_join(folder, filename)
+    try:
+        if path is None or recently_stored(path):
+            return False
+        os.remove(path)
+    except FileNotFoundError:
+        return False
+
+    # Variants belong to the content, which another level may still use
+    # under a different extension
+    content_addressed = CONTENT_ADDRESSED_NAME.match(filename)
+    if content_addressed and not Level.query.filter(Level.image_path.startswith(UPLOAD_URL_PREFIX + content_addressed.group(1))).count():
+        for entry in os.scandir(folder):
+            if entry.name.startswith(content_addressed.group(1) + '-w'):
+                os.remove(entry.path)
+    return True
+
+# Removes files in UPLOAD_FOLDER that no level refers to and that are older
+# than the grace period. Returns (filename, size) for each removed file.
+def collect_upload_garbage(dry_run=False):
+    folder = current_app.config['UPLOAD_FOLDER']
+    if not os.path.isdir(folder):
+        return []
+
+    referenced = {upload_filename(image_path) for (image_path,) in db.session.query(Level.image_path).distinct()}
+    referenced_digests = {match.group(1) for match in map(CONTENT_ADDRESSED_NAME.match, filter(None, referenced)) if match}
+    removed = []
+    for entry in os.scandir(folder):
+        if not entry.is_file() or entry.name in referenced or recently_stored(entry.path):
+            continue
+        content_addressed = CONTENT_ADDRESSED_NAME.match(entry.name)
+        if content_addressed and content_addressed.group(2) and content_addressed.group(1) in referenced_digests:
+            continue
+        size = entry.stat().st_size
+        if not dry_run:
+            os.remove(entry.path)
+        removed.append((entry.name, size))
+    return removed
+
+# Moves levels still pointing at uuid4()_filename uploads onto content-hash
+# names, so duplicates collapse into one file. The old files are left for
+# collect_upload_garbage(). Returns the number of levels updated.
+def content_address_uploads():
+    from app.queries import bump_catalog_version
+
+    folder = current_app.config['UPLOAD_FOLDER']
+    chunk_size = current_app.config.get('UPLOAD_CHUNK_SIZE', 65536)
+    updated = 0
+    for level in Level.query.filter(Level.image_path.startswith(UPLOAD_URL_PREFIX)):
+        filename = upload_filename(level.image_path)
+        path = safe_join(folder, filename)
+        if CONTENT_ADDRESSED_NAME.match(filename) or path is None or not os.path.isfile(path):
+            continue
+        with open(path, 'rb') as f:
+            content_filename = hash_file(f, chunk_size) + upload_extension(filename)
+        content_path = os.path.join(folder, content_filename)
+        if not os.path.exists(content_path):
+            shutil.copyfile(path, content_path)
+        level.image_path = UPLOAD_URL_PREFIX + content_filename
+        updated += 1
+
+    if updated:
+        bump_catalog_version()
+    db.session.commit()
+    return updated
+
+# send_from_directory answers If-None-Match/If-Modified-Since with 304 and
+# Range with 206. With UPLOAD_ACCEL_REDIRECT set, nginx is told to serve the
+# file from that internal location instead; USE_X_SENDFILE does the same
+# for servers that understand X-Sendfile.
+def upload_response(filename):
+    folder = current_app.config['UPLOAD_FOLDER']
+    if filename.startswith('.'):
+        raise NotFound()
+    content_addressed = CONTENT_ADDRESSED_NAME.match(filename)
+    max_age = current_app.config.get('UPLOAD_CACHE_MAX_AGE', 31536000) if content_addressed else None
+
+    accel_redirect = current_app.config.get('UPLOAD_ACCEL_REDIRECT')
+    if accel_redirect:
+        path = safe_join(folder, filename)
+        if path is None or not os.path.isfile(path):
+            raise NotFound()
+        response = current_app.response_class(mimetype=mimetypes.guess_type(filename)[0] or 'application/octet-stream')
+        response.headers['X-Accel-Redirect'] = accel_redirect.rstrip('/') + '/' + filename
+    else:
+        response = send_from_directory(
+            folder, filename,
+            etag=content_addressed.group(1) + (content_addressed.group(2) or '') if content_addressed else True,
+            max_age=max_age
+        )
+
+    if content_addressed:
+        response.cache_control.no_cache = None
+        response.cache_control.public = True
+        response.cache_control.max_age = max_age
+        response.cache_control.immutable = True
+    else:
+        response.cache_control.no_cache = True
+    return response
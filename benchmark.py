@@ -0,0 +1,682 @@
+"""
+Performance Benchmarks for Educational App
+This script measures the hot database and serialization paths of the app
+"""
+
+import argparse
+import json
+import logging
+import os
+import importlib.util
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+from flask_jwt_extended import JWTManager, create_access_token
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+
+from app import create_app, db, cache, password_hasher
+from app.compression import available_encodings, compress
+from app.config import Config
+from app.database import init_database
+from app.passwords import hash_password
+from app.models import User, Level, Video, UserLevel, UserVideoProgress, WelcomeVideo
+from app.progress import convert_progress_storage
+from app.serialization import OrjsonProvider, orjson
+from app.queries import QuestionCache, enroll_users, load_catalog, load_user_levels, record_video_completed, record_video_opened, video_state
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Child interpreters and servers run from the repository so they import this
+# checkout's app package wherever the benchmark is started from.
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+LOOKUP_INDEXES = [
+    'ix_user_role',
+    'ix_video_level_id',
+    'ix_user_level_user_id_level_id',
+    'ix_user_level_level_id',
+    'ix_user_video_progress_user_level_id_video_id',
+    'ix_user_video_progress_video_id',
+    'ix_exam_result_user_id_level_id',
+]
+
+def create_engine_for(path):
+    engine = create_engine(f'sqlite:///{path}')
+    db.metadata.create_all(engine)
+    return engine
+
+def insert_in_batches(conn, table, rows, batch_size=50000):
+    for start in range(0, len(rows), batch_size):
+        conn.execute(table.insert(), rows[start:start + batch_size])
+
+def create_bench_app(path):
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{path}'
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+    return app
+
+def time_lookups(conn, statement, params, repeat):
+    start = time.perf_counter()
+    for i in range(repeat):
+        conn.exec_driver_sql(statement, params[i % len(params)]).fetchall()
+    return (time.perf_counter() - start) / repeat * 1000
+
+def bench_progress_lookups(progress_rows=1000000, videos_per_level=40, repeat=200):
+    """Time the progress lookups used by routes.py with and without the lookup indexes"""
+    logger.info(f"📊 Progress lookups at {progress_rows:,} progress rows...")
+
+    user_levels_count = progress_rows // videos_per_level
+    levels_count = 50
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine_for(os.path.join(tmp, 'bench.db'))
+        with engine.begin() as conn:
+            insert_in_batches(conn, Level.__table__, [
+                {'id': i, 'name': f'Level {i}', 'level_number': i, 'price': 10.0}
+                for i in range(1, levels_count + 1)
+            ])
+            insert_in_batches(conn, Video.__table__, [
+                {'id': (l - 1) * videos_per_level + v, 'level_id': l, 'youtube_link': f'https://youtu.be/{l}-{v}'}
+                for l in range(1, levels_count + 1) for v in range(1, videos_per_level + 1)
+            ])
+            insert_in_batches(conn, User.__table__, [
+                {'id': i, 'name': f'User {i}', 'email': f'user{i}@test.com', 'password': 'x', 'role': 'client', 'token_version': 0}
+                for i in range(1, user_levels_count + 1)
+            ])
+            insert_in_batches(conn, UserLevel.__table__, [
+                {'id': i, 'user_id': i, 'level_id': (i % levels_count) + 1}
+                for i in range(1, user_levels_count + 1)
+            ])
+            insert_in_batches(conn, UserVideoProgress.__table__, [
+                {'user_level_id': ul, 'video_id': (ul % levels_count) * videos_per_level + v, 'is_opened': v == 1, 'is_completed': False}
+                for ul in range(1, user_levels_count + 1) for v in range(1, videos_per_level + 1)
+            ])
+
+        rng = random.Random(42)
+        samples = [rng.randint(1, user_levels_count) for _ in range(100)]
+        queries = {
+            'user_level by (user_id, level_id)': (
+                'SELECT * FROM user_level WHERE user_id = ? AND level_id = ?',
+                [(ul, (ul % levels_count) + 1) for ul in samples]
+            ),
+            'progress by (user_level_id, video_id)': (
+                'SELECT * FROM user_video_progress WHERE user_level_id = ? AND video_id = ?',
+                [(ul, (ul % levels_count) * videos_per_level + 1) for ul in samples]
+            ),
+            'progress count by video_id': (
+                'SELECT COUNT(*) FROM user_video_progress WHERE video_id = ?',
+                [((ul % levels_count) * videos_per_level + 1,) for ul in samples]
+            ),
+        }
+
+        results = {}
+        with engine.connect() as conn:
+            for name in LOOKUP_INDEXES:
+                conn.exec_driver_sql(f'DROP INDEX IF EXISTS {name}')
+            conn.commit()
+            for label, (statement, params) in queries.items():
+                results[label] = [time_lookups(conn, statement, params, max(repeat // 20, 5))]
+
+            for table in db.metadata.sorted_tables:
+                for index in table.indexes:
+                    index.create(conn, checkfirst=True)
+            conn.commit()
+            for label, (statement, params) in queries.items():
+                results[label].append(time_lookups(conn, statement, params, repeat))
+
+        engine.dispose()
+
+    for label, (before, after) in results.items():
+        logger.info(f"   {label}: {before:.3f} ms -> {after:.3f} ms ({before / after:.0f}x)")
+    return results
+
+def bench_question_cache(videos_count=50, questions_per_video=200, repeat=100):
+    """Time serializing a level's videos with and without the parsed-question cache"""
+    logger.info(f"📊 Question parsing for a level with {videos_count} videos x {questions_per_video} questions...")
+
+    videos = [
+        Video(id=v, level_id=1, revision=0, youtube_link=f'https://youtu.be/{v}', questions=json.dumps([{
+            'question': f'Question {q} about video {v}: what is the main concept explained here?',
+            'options': [f'Option {o} for question {q}' for o in range(4)],
+            'answer': q % 4
+        } for q in range(questions_per_video)]))
+        for v in range(1, videos_count + 1)
+    ]
+    cache = QuestionCache()
+
+    def serialize(parse):
+        return [{'id': v.id, 'youtube_link': v.youtube_link, 'questions': parse(v)} for v in videos]
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        serialize(lambda v: json.loads(v.questions) if v.questions else [])
+    uncached = (time.perf_counter() - start) / repeat * 1000
+
+    serialize(cache.get)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        serialize(cache.get)
+    cached = (time.perf_counter() - start) / repeat * 1000
+
+    logger.info(f"   json.loads per request: {uncached:.3f} ms")
+    logger.info(f"   cached parse:           {cached:.3f} ms ({uncached / cached:.0f}x)")
+    return uncached, cached
+
+def bench_enrollment(users_count=5000, videos_per_level=40):
+    """Time enrolling a cohort in a level with per-video ORM rows and with enroll_users"""
+    logger.info(f"📊 Enrolling {users_count:,} users in a {videos_per_level}-video level...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app = create_bench_app(os.path.join(tmp, 'bench.db'))
+        with app.app_context():
+            db.session.execute(db.insert(Level), [
+                {'id': l, 'name': f'Level {l}', 'level_number': l, 'price': 10.0} for l in (1, 2)
+            ])
+            db.session.execute(db.insert(Video), [
+                {'level_id': l, 'youtube_link': f'https://youtu.be/{l}-{v}'}
+                for l in (1, 2) for v in range(videos_per_level)
+            ])
+            db.session.execute(db.insert(User), [
+                {'name': f'User {i}', 'email': f'user{i}@test.com', 'password': 'x', 'role': 'client', 'token_version': 0}
+                for i in range(users_count)
+            ])
+            db.session.commit()
+            user_ids = [user_id for (user_id,) in db.session.query(User.id)]
+
+            start = time.perf_counter()
+            level_videos = Video.query.filter_by(level_id=1).order_by(Video.id).all()
+            for user_id in user_ids:
+                user_level = UserLevel(user_id=user_id, level_id=1, total_videos_count=len(level_videos))
+                db.session.add(user_level)
+                db.session.flush()
+                for i, video in enumerate(level_videos):
+                    db.session.add(UserVideoProgress(user_level_id=user_level.id, video_id=video.id, is_opened=(i == 0)))
+            db.session.commit()
+            orm = time.perf_counter() - start
+
+            start = time.perf_counter()
+            enroll_users(2, user_ids)
+            db.session.commit()
+            bulk = time.perf_counter() - start
+
+        with app.app_context():
+            db.engine.dispose()
+
+    logger.info(f"   per-video ORM rows: {orm:.2f} s")
+    logger.info(f"   enroll_users:       {bulk:.2f} s ({orm / bulk:.0f}x)")
+    return orm, bulk
+
+def bench_progress_storage(users_count=200, levels_count=20, videos_per_level=40, repeat=20):
+    """Compare reading a user's progress from per-video rows and from UserLevel bitsets"""
+    logger.info(f"📊 Progress storage for {users_count} users x {levels_count} levels x {videos_per_level} videos...")
+
+    def read_user_levels(user_id):
+        user_levels, progress = load_user_levels(user_id)
+        return [[
+            video_state(user_level, index, video.id, progress.get((user_level.id, video.id)))
+            for index, video in enumerate(user_level.level.videos)
+        ] for user_level in user_levels]
+
+    def time_reads(user_ids):
+        start = time.perf_counter()
+        for i in range(repeat):
+            read_user_levels(user_ids[i % len(user_ids)])
+            db.session.expunge_all()
+        return (time.perf_counter() - start) / repeat * 1000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app = create_bench_app(os.path.join(tmp, 'bench.db'))
+        with app.app_context():
+            db.session.execute(db.insert(Level), [
+                {'id': l, 'name': f'Level {l}', 'level_number': l, 'price': 10.0} for l in range(1, levels_count + 1)
+            ])
+            db.session.execute(db.insert(Video), [
+                {'level_id': l, 'youtube_link': f'https://youtu.be/{l}-{v}'}
+                for l in range(1, levels_count + 1) for v in range(videos_per_level)
+            ])
+            db.session.execute(db.insert(User), [
+                {'name': f'User {i}', 'email': f'user{i}@test.com', 'password': 'x', 'role': 'client', 'token_version': 0}
+                for i in range(users_count)
+            ])
+            user_ids = [user_id for (user_id,) in db.session.query(User.id)]
+            for level_id in range(1, levels_count + 1):
+                enroll_users(level_id, user_ids)
+
+            # Materialize the row-per-video layout with the first half of every level completed
+            rows = []
+            for user_level_id, level_id in db.session.query(UserLevel.id, UserLevel.level_id):
+                video_ids = [video_id for (video_id,) in db.session.query(Video.id).filter_by(level_id=level_id).order_by(Video.id)]
+                for index, video_id in enumerate(video_ids):
+                    rows.append({
+                        'user_level_id': user_level_id,
+                        'video_id': video_id,
+                        'is_opened': index <= videos_per_level // 2,
+                        'is_completed': index < videos_per_level // 2
+                    })
+            db.session.execute(db.insert(UserVideoProgress), rows)
+            db.session.commit()
+
+            app.config['PROGRESS_STORAGE'] = 'rows'
+            rows_ms = time_reads(user_ids)
+            rows_count = UserVideoProgress.query.count()
+
+            convert_progress_storage('bitset')
+            app.config['PROGRESS_STORAGE'] = 'bitset'
+            bitset_ms = time_reads(user_ids)
+            bitset_bytes = sum(
+                len(opened or b'') + len(completed or b'')
+                for opened, completed in db.session.query(UserLevel.opened_bits, UserLevel.completed_bits)
+            )
+
+            db.engine.dispose()
+
+    logger.info(f"   rows:   {rows_ms:.3f} ms per user, {rows_count:,} progress rows")
+    logger.info(f"   bitset: {bitset_ms:.3f} ms per user, {bitset_bytes:,} bytes of bitsets ({rows_ms / bitset_ms:.1f}x)")
+    return rows_ms, bitset_ms
+
+def bench_login_hashing(concurrency=32, logins=160, rounds=10):
+    """Send concurrent POST /login requests, hashing inline vs pooled, and count the 503s shed under load"""
+    logger.info(f"🔐 {logins} logins from {concurrency} concurrent clients at bcrypt cost {rounds}...")
+
+    workers = os.cpu_count() or 1
+    configurations = [
+        ('inline', 0, 'thread', logins),
+        (f'thread pool ({workers})', workers, 'thread', logins),
+        (f'process pool ({workers})', workers, 'process', logins),
+        (f'thread pool ({workers}), 8 pending', workers, 'thread', 8),
+    ]
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, pool_workers, executor, max_pending in configurations:
+            class LoginConfig(Config):
+                SQLALCHEMY_DATABASE_URI = 'sqlite:///' + os.path.join(tmp, f'login-{len(results)}.db')
+                CREATE_SCHEMA_ON_STARTUP = True
+                BCRYPT_LOG_ROUNDS = rounds
+                PASSWORD_HASH_WORKERS = pool_workers
+                PASSWORD_HASH_EXECUTOR = executor
+                PASSWORD_HASH_MAX_PENDING = max_pending
+
+            app = create_app(LoginConfig)
+            with app.app_context():
+                db.session.add(User(name='Bench', email='bench@example.com', password=hash_password('secret', rounds), role='client'))
+                db.session.commit()
+            credentials = {'email': 'bench@example.com', 'password': 'secret'}
+            app.test_client().post('/login', json=credentials) # warm up the pool
+
+            def login(_):
+                start = time.perf_counter()
+                response = app.test_client().post('/login', json=credentials)
+                return response.status_code, response.headers.get('Retry-After'), time.perf_counter() - start
+
+            start = time.perf_counter()
+            with ThreadPoolExecutor(concurrency) as clients:
+                responses = list(clients.map(login, range(logins)))
+            elapsed = time.perf_counter() - start
+            password_hasher.shutdown()
+
+            served = sorted(latency for status, _, latency in responses if status == 200)
+            shed = sum(1 for status, retry_after, _ in responses if status == 503 and retry_after)
+            failed = logins - len(served) - shed
+            p95_ms = served[int(len(served) * 0.95) - 1] * 1000 if served else 0
+            results[label] = len(served) / elapsed
+            logger.info(f"   {label}: {len(served) / elapsed:.1f} logins/s, p95 {p95_ms:.0f} ms, {shed} shed with 503 + Retry-After"
+                        + (f", {failed} failed" if failed else ""))
+
+    return results
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def wait_for_server(url, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            urllib.request.urlopen(url, timeout=1)
+            return True
+        except urllib.error.HTTPError:
+            return True
+        except OSError:
+            time.sleep(0.2)
+    return False
+
+def bench_serving(presets=('threaded', 'sync', 'gthread', 'gevent'), concurrency=32, duration=10,
+                  levels_count=50, videos_per_level=20, launcher='serve.py'):
+    """Drive read-heavy endpoints through each serve.py worker preset and compare throughput"""
+    logger.info(f"🌐 Read-heavy load, {concurrency} concurrent clients for {duration}s per worker preset...")
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'bench.db')
+        app = create_bench_app(path)
+        app.config['JWT_SECRET_KEY'] = Config.JWT_SECRET_KEY
+        JWTManager(app)
+        with app.app_context():
+            user = User(name='Client', email='client@test.com', password='x', role='client', token_version=0)
+            db.session.add(user)
+            db.session.add(WelcomeVideo(video_url='https://youtu.be/welcome'))
+            for l in range(levels_count):
+                level = Level(name=f'Level {l}', level_number=l, price=10.0, image_path=f'/Uploads/levels/{l}.jpg')
+                level.videos = [
+                    Video(youtube_link=f'https://youtu.be/{l}-{v}', questions=json.dumps([{'q': f'Question {q}', 'a': 'answer'} for q in range(10)]))
+                    for v in range(videos_per_level)
+                ]
+                db.session.add(level)
+            db.session.commit()
+            token = create_access_token(identity=str(user.id))
+            level_ids = [level_id for (level_id,) in db.session.query(Level.id)]
+            db.engine.dispose()
+
+        env = dict(os.environ, DATABASE_URL=f'sqlite:///{path}')
+        headers = {'Authorization': f'Bearer {token}'}
+
+        for preset in presets:
+            if preset != 'threaded' and importlib.util.find_spec('gunicorn') is None:
+                logger.info(f"   {preset}: skipped, gunicorn is not installed")
+                continue
+            if preset == 'gevent' and importlib.util.find_spec('gevent') is None:
+                logger.info(f"   {preset}: skipped, gevent is not installed")
+                continue
+
+            base_url = f'http://127.0.0.1:{free_port()}'
+            server = subprocess.Popen(
+                [sys.executable, launcher, '--preset', preset, '--bind', base_url[len('http://'):]],
+                env=env, cwd=REPO_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+            )
+            try:
+                if not wait_for_server(base_url + '/welcome_video'):
+                    logger.info(f"   {preset}: server did not start")
+                    continue
+
+                paths = ['/levels', '/welcome_video'] + [f'/levels/{level_id}' for level_id in level_ids[:10]]
+                deadline = time.time() + duration
+
+                def client(index):
+                    latencies, errors = [], 0
+                    i = index
+                    while time.time() < deadline:
+                        request = urllib.request.Request(base_url + paths[i % len(paths)], headers=headers)
+                        i += 1
+                        start = time.perf_counter()
+                        try:
+                            urllib.request.urlopen(request, timeout=30).read()
+                            latencies.append(time.perf_counter() - start)
+                        except OSError:
+                            errors += 1
+                    return latencies, errors
+
+                with ThreadPoolExecutor(concurrency) as clients:
+                    outcomes = list(clients.map(client, range(concurrency)))
+            finally:
+                server.terminate()
+                server.wait()
+
+            latencies = sorted(latency for outcome in outcomes for latency in outcome[0])
+            errors = sum(outcome[1] for outcome in outcomes)
+            p95_ms = latencies[int(len(latencies) * 0.95) - 1] * 1000 if latencies else 0
+            results[preset] = len(latencies) / duration
+            logger.info(f"   {preset}: {len(latencies) / duration:.0f} req/s, p95 {p95_ms:.0f} ms, {errors} errors")
+
+    return results
+
+def bench_sqlite_concurrency(readers=8, writers=4, duration=5, users_count=200, levels_count=5, videos_per_level=20):
+    """Compare concurrent progress reads and complete_video-style writes with SQLite's defaults and the tuned pragmas"""
+    logger.info(f"🗄️ {readers} readers and {writers} writers against one SQLite file for {duration} s per profile...")
+
+    profiles = {
+        'SQLite defaults (rollback journal)': {name: '' for name in (
+            'SQLITE_JOURNAL_MODE', 'SQLITE_SYNCHRONOUS', 'SQLITE_BUSY_TIMEOUT', 'SQLITE_CACHE_SIZE', 'SQLITE_MMAP_SIZE'
+        )},
+        'tuned (WAL, synchronous=NORMAL, mmap)': {},
+    }
+
+    results = {}
+    for label, overrides in profiles.items():
+        with tempfile.TemporaryDirectory() as tmp:
+            app = Flask(__name__)
+            app.config.from_object(Config)
+            app.config.update(overrides, SQLALCHEMY_DATABASE_URI=f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+            init_database(app)
+
+            with app.app_context():
+                db.create_all()
+                db.session.execute(db.insert(Level), [
+                    {'id': l, 'name': f'Level {l}', 'level_number': l, 'price': 10.0} for l in range(1, levels_count + 1)
+                ])
+                db.session.execute(db.insert(Video), [
+                    {'level_id': l, 'youtube_link': f'https://youtu.be/{l}-{v}'}
+                    for l in range(1, levels_count + 1) for v in range(videos_per_level)
+                ])
+                db.session.execute(db.insert(User), [
+                    {'name': f'User {i}', 'email': f'user{i}@test.com', 'password': 'x', 'role': 'client', 'token_version': 0}
+                    for i in range(users_count)
+                ])
+                user_ids = [user_id for (user_id,) in db.session.query(User.id)]
+                for level_id in range(1, levels_count + 1):
+                    enroll_users(level_id, user_ids)
+                db.session.commit()
+                user_levels = db.session.query(UserLevel.id, UserLevel.level_id).all()
+                level_videos = {}
+                for video_id, level_id in db.session.query(Video.id, Video.level_id):
+                    level_videos.setdefault(level_id, []).append(video_id)
+
+            def read(rng):
+                load_user_levels(rng.choice(user_ids))
+
+            # The rows-layout write path of POST /progress/.../complete
+            def write(rng):
+                user_level_id, level_id = rng.choice(user_levels)
+                video_id = rng.choice(level_videos[level_id])
+                if not UserVideoProgress.query.filter_by(user_level_id=user_level_id, video_id=video_id).first():
+                    db.session.add(UserVideoProgress(user_level_id=user_level_id, video_id=video_id, is_opened=True, is_completed=True))
+                    record_video_completed(user_level_id)
+                record_video_opened(user_level_id, video_id)
+                db.session.commit()
+
+            def client(operation, seed, deadline):
+                rng = random.Random(seed)
+                latencies, errors = [], 0
+                with app.app_context():
+                    while time.perf_counter() < deadline:
+                        start = time.perf_counter()
+                        try:
+                            operation(rng)
+                        except OperationalError:
+                            db.session.rollback()
+                            errors += 1
+                            continue
+                        finally:
+                            db.session.remove()
+                        latencies.append(time.perf_counter() - start)
+                return operation, latencies, errors
+
+            deadline = time.perf_counter() + duration
+            with ThreadPoolExecutor(readers + writers) as pool:
+                runs = [pool.submit(client, read, i, deadline) for i in range(readers)]
+                runs += [pool.submit(client, write, readers + i, deadline) for i in range(writers)]
+                outcomes = [run.result() for run in runs]
+
+            with app.app_context():
+                db.engine.dispose()
+
+        summary = {}
+        for operation, name in ((read, 'reads'), (write, 'writes')):
+            latencies = sorted(latency for op, op_latencies, _ in outcomes if op is operation for latency in op_latencies)
+            errors = sum(op_errors for op, _, op_errors in outcomes if op is operation)
+            p95_ms = latencies[int(len(latencies) * 0.95) - 1] * 1000 if latencies else 0
+            summary[name] = len(latencies) / duration
+            logger.info(f"   {label} {name}: {len(latencies) / duration:.0f}/s, p95 {p95_ms:.1f} ms, {errors} locked errors")
+        results[label] = summary
+
+    return results
+
+def bench_json_catalog(levels_count=500, videos_per_level=10, questions_per_video=5, repeat=20):
+    """Time serializing a level catalog with each JSON provider, and its size under each compression"""
+    logger.info(f"🗜️ Serializing a {levels_count}-level catalog ({videos_per_level} videos, {questions_per_video} questions each)...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app = create_bench_app(os.path.join(tmp, 'bench.db'))
+        app.config['UPLOAD_FOLDER'] = tmp
+        cache.init_app(app)
+        with app.app_context():
+            db.session.execute(db.insert(Level), [{
+                'id': l,
+                'name': f'Level {l}',
+                'level_number': l,
+                'price': 10.0,
+                'description': f'Vocabulary and listening practice for level {l}',
+                'image_path': f'/Uploads/levels/{l:064x}.jpg',
+                'initial_exam_question': 'Write down every word you recognise.',
+                'final_exam_question': 'Write down every word you learned.'
+            } for l in range(1, levels_count + 1)])
+            db.session.execute(db.insert(Video), [{
+                'level_id': l,
+                'youtube_link': f'https://youtu.be/{l}-{v}',
+                'questions': json.dumps([f'What does word {q} in video {v} mean?' for q in range(questions_per_video)])
+            } for l in range(1, levels_count + 1) for v in range(videos_per_level)])
+            db.session.commit()
+
+            catalog = load_catalog(Level.query, ('bench',))
+            # Shaped like GET /admin/levels, which embeds every video's questions
+            payload = [dict(entry['level'], videos=entry['videos'], user_count=0) for entry in catalog]
+
+            providers = {'stdlib json': DefaultJSONProvider(app)}
+            if orjson is not None:
+                providers['orjson'] = OrjsonProvider(app)
+            else:
+                logger.info("   orjson is not installed (pip install orjson), timing the stdlib provider only")
+
+            results = {}
+            for label, provider in providers.items():
+                start = time.perf_counter()
+                for _ in range(repeat):
+                    body = provider.response(payload).get_data()
+                results[label] = (time.perf_counter() - start) / repeat * 1000
+                logger.info(f"   {label}: {results[label]:.1f} ms, {len(body):,} bytes")
+
+            for encoding in available_encodings():
+                start = time.perf_counter()
+                for _ in range(repeat):
+                    compressed = compress(body, encoding, app.config)
+                elapsed_ms = (time.perf_counter() - start) / repeat * 1000
+                results[encoding] = len(compressed)
+                logger.info(f"   {encoding}: {elapsed_ms:.1f} ms, {len(compressed):,} bytes ({len(body) / len(compressed):.0f}x smaller)")
+
+            db.engine.dispose()
+
+    return results
+
+STARTUP_SNIPPET = """
+import time
+start = time.perf_counter()
+from app import create_app
+app = create_app()
+ready = time.perf_counter()
+app.test_client().get('/levels')
+print((ready - start) * 1000, (time.perf_counter() - start) * 1000)
+"""
+
+def bench_startup(runs=5, budget_ms=None):
+    """Profile imports and time cold create_app() plus the first request with each startup option"""
+    budget_ms = budget_ms or float(os.environ.get('STARTUP_BUDGET_MS', 0)) or None
+    logger.info("⏱️ Cold start of create_app() and the first request in fresh interpreters...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'bench.db')
+        with create_bench_app(path).app_context():
+            db.engine.dispose()
+
+        env = dict(os.environ, DATABASE_URL=f'sqlite:///{path}')
+
+        profile = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', STARTUP_SNIPPET],
+            env=env, cwd=REPO_DIR, capture_output=True, text=True
+        )
+        if profile.returncode != 0:
+            raise SystemExit(f"Startup benchmark failed:\n{profile.stderr.strip()}")
+        imports = []
+        for line in profile.stderr.splitlines():
+            if not line.startswith('import time:') or 'cumulative' in line:
+                continue
+            _, self_us, cumulative_us, name = [part.strip() for part in line.replace('import time:', '|').split('|')]
+            if '.' not in name:
+                imports.append((int(cumulative_us), name))
+        logger.info("   slowest top-level imports (cumulative):")
+        for cumulative_us, name in sorted(imports, reverse=True)[:8]:
+            logger.info(f"     {name}: {cumulative_us / 1000:.1f} ms")
+
+        modes = {
+            'defaults': {},
+            'migrations loaded': {'LOAD_MIGRATIONS': '1'},
+            'no schema check': {'CREATE_SCHEMA_ON_STARTUP': '0'},
+            'lazy blueprints': {'LAZY_BLUEPRINTS': '1'},
+        }
+        results = {}
+        failed = []
+        for label, overrides in modes.items():
+            timings = []
+            for _ in range(runs):
+                run = subprocess.run(
+                    [sys.executable, '-c', STARTUP_SNIPPET],
+                    env=dict(env, **overrides), cwd=REPO_DIR, capture_output=True, text=True
+                )
+                if run.returncode != 0:
+                    logger.info(f"   {label}: failed\n{run.stderr.strip()}")
+                    failed.append(label)
+                    break
+                timings.append(tuple(float(value) for value in run.stdout.strip().splitlines()[-1].split()))
+            else:
+                create_ms = sorted(create for create, _ in timings)[len(timings) // 2]
+                results[label] = sorted(first for _, first in timings)[len(timings) // 2]
+                logger.info(f"   {label}: create_app {create_ms:.0f} ms, first response after {results[label]:.0f} ms (medians over {runs} runs)")
+
+    # The budget covers the first response, so deferring work from
+    # create_app() to the first request cannot hide it
+    if failed:
+        raise SystemExit(f"Startup benchmark failed in: {', '.join(failed)}")
+    default_ms = results['defaults']
+    if budget_ms and default_ms > budget_ms:
+        raise SystemExit(f"Startup budget exceeded: {default_ms:.0f} ms > {budget_ms:.0f} ms")
+    return results
+
+BENCHMARKS = {
+    'indexes': bench_progress_lookups,
+    'questions': bench_question_cache,
+    'enrollment': bench_enrollment,
+    'bitset': bench_progress_storage,
+    'login': bench_login_hashing,
+    'serving': bench_serving,
+    'sqlite': bench_sqlite_concurrency,
+    'json': bench_json_catalog,
+    'startup': bench_startup,
+}
+
+def main():
+    """Run the selected benchmarks"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('benchmarks', nargs='*', choices=sorted(BENCHMARKS), help='benchmarks to run (default: all)')
+    args = parser.parse_args()
+
+    logger.info("🚀 Starting Educational App Benchmarks...\n")
+    for name in args.benchmarks or BENCHMARKS:
+        BENCHMARKS[name]()
+    logger.info("\n🎉 All benchmarks completed!")
+
+if __name__ == "__main__":
+    main()
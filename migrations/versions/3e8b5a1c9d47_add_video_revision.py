@@ -0,0 +1,26 @@
+"""add video revision
+
+Revision ID: 3e8b5a1c9d47
+Revises: 7c2d9e4f1a3b
+Create Date: 2026-10-17 05:02:41.118730
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3e8b5a1c9d47'
+down_revision = '7c2d9e4f1a3b'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('video', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('revision', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade():
+    with op.batch_alter_table('video', schema=None) as batch_op:
+        batch_op.drop_column('revision')
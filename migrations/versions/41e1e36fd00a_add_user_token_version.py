@@ -0,0 +1,26 @@
+"""add user token_version
+
+Revision ID: 41e1e36fd00a
+Revises: b1fbf7cb0a53
+Create Date: 2026-10-17 04:05:39.838411
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '41e1e36fd00a'
+down_revision = 'b1fbf7cb0a53'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('token_version', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade():
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.drop_column('token_version')
@@ -0,0 +1,106 @@
+"""add lookup indexes
+
+Revision ID: 7c2d9e4f1a3b
+Revises: 41e1e36fd00a
+Create Date: 2026-10-17 04:20:12.504118
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7c2d9e4f1a3b'
+down_revision = '41e1e36fd00a'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    merge_duplicate_user_levels()
+    merge_duplicate_video_progress()
+
+    op.create_index('ix_user_role', 'user', ['role'], unique=False)
+    op.create_index('ix_video_level_id', 'video', ['level_id'], unique=False)
+    op.create_index('ix_user_level_user_id_level_id', 'user_level', ['user_id', 'level_id'], unique=True)
+    op.create_index('ix_user_level_level_id', 'user_level', ['level_id'], unique=False)
+    op.create_index('ix_user_video_progress_user_level_id_video_id', 'user_video_progress', ['user_level_id', 'video_id'], unique=True)
+    op.create_index('ix_user_video_progress_video_id', 'user_video_progress', ['video_id'], unique=False)
+    op.create_index('ix_exam_result_user_id_level_id', 'exam_result', ['user_id', 'level_id'], unique=False)
+
+
+# The unique indexes below would fail on databases where a double-submitted
+# purchase or completion stored the same row twice. Duplicates are merged
+# into the row with the lowest id: flags are kept if any copy had them,
+# scores come from whichever copy has one, and progress rows move to the
+# kept user_level.
+def merge_duplicate_user_levels():
+    op.execute("""
+        UPDATE user_level SET
+            is_completed = EXISTS (
+                SELECT 1 FROM user_level AS duplicate
+                WHERE duplicate.user_id = user_level.user_id AND duplicate.level_id = user_level.level_id
+                AND duplicate.is_completed
+            ),
+            can_take_final_exam = EXISTS (
+                SELECT 1 FROM user_level AS duplicate
+                WHERE duplicate.user_id = user_level.user_id AND duplicate.level_id = user_level.level_id
+                AND duplicate.can_take_final_exam
+            ),
+            initial_exam_score = COALESCE(initial_exam_score, (
+                SELECT MAX(duplicate.initial_exam_score) FROM user_level AS duplicate
+                WHERE duplicate.user_id = user_level.user_id AND duplicate.level_id = user_level.level_id
+            )),
+            final_exam_score = COALESCE(final_exam_score, (
+                SELECT MAX(duplicate.final_exam_score) FROM user_level AS duplicate
+                WHERE duplicate.user_id = user_level.user_id AND duplicate.level_id = user_level.level_id
+            ))
+        WHERE id IN (SELECT MIN(id) FROM user_level GROUP BY user_id, level_id HAVING COUNT(*) > 1)
+    """)
+    op.execute("""
+        UPDATE user_level SET score_difference = final_exam_score - initial_exam_score
+        WHERE final_exam_score IS NOT NULL AND initial_exam_score IS NOT NULL
+        AND id IN (SELECT MIN(id) FROM user_level GROUP BY user_id, level_id HAVING COUNT(*) > 1)
+    """)
+    op.execute("""
+        UPDATE user_video_progress SET user_level_id = (
+            SELECT MIN(kept.id) FROM user_level AS kept
+            JOIN user_level AS duplicate ON duplicate.user_id = kept.user_id AND duplicate.level_id = kept.level_id
+            WHERE duplicate.id = user_video_progress.user_level_id
+        )
+        WHERE user_level_id NOT IN (SELECT MIN(id) FROM user_level GROUP BY user_id, level_id)
+    """)
+    op.execute("""
+        DELETE FROM user_level
+        WHERE id NOT IN (SELECT MIN(id) FROM user_level GROUP BY user_id, level_id)
+    """)
+
+def merge_duplicate_video_progress():
+    op.execute("""
+        UPDATE user_video_progress SET
+            is_opened = EXISTS (
+                SELECT 1 FROM user_video_progress AS duplicate
+                WHERE duplicate.user_level_id = user_video_progress.user_level_id AND duplicate.video_id = user_video_progress.video_id
+                AND duplicate.is_opened
+            ),
+            is_completed = EXISTS (
+                SELECT 1 FROM user_video_progress AS duplicate
+                WHERE duplicate.user_level_id = user_video_progress.user_level_id AND duplicate.video_id = user_video_progress.video_id
+                AND duplicate.is_completed
+            )
+        WHERE id IN (SELECT MIN(id) FROM user_video_progress GROUP BY user_level_id, video_id HAVING COUNT(*) > 1)
+    """)
+    op.execute("""
+        DELETE FROM user_video_progress
+        WHERE id NOT IN (SELECT MIN(id) FROM user_video_progress GROUP BY user_level_id, video_id)
+    """)
+
+
+def downgrade():
+    op.drop_index('ix_exam_result_user_id_level_id', table_name='exam_result')
+    op.drop_index('ix_user_video_progress_video_id', table_name='user_video_progress')
+    op.drop_index('ix_user_video_progress_user_level_id_video_id', table_name='user_video_progress')
+    op.drop_index('ix_user_level_level_id', table_name='user_level')
+    op.drop_index('ix_user_level_user_id_level_id', table_name='user_level')
+    op.drop_index('ix_video_level_id', table_name='video')
+    op.drop_index('ix_user_role', table_name='user')
@@ -0,0 +1,40 @@
+"""add user_level progress counters
+
+Revision ID: 9a4f6c2e8b15
+Revises: 3e8b5a1c9d47
+Create Date: 2026-10-17 05:41:07.562390
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9a4f6c2e8b15'
+down_revision = '3e8b5a1c9d47'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('user_level', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('completed_videos_count', sa.Integer(), nullable=False, server_default='0'))
+        batch_op.add_column(sa.Column('total_videos_count', sa.Integer(), nullable=False, server_default='0'))
+
+    op.execute("""
+        UPDATE user_level SET
+            total_videos_count = (
+                SELECT COUNT(*) FROM video WHERE video.level_id = user_level.level_id
+            ),
+            completed_videos_count = (
+                SELECT COUNT(*) FROM user_video_progress
+                WHERE user_video_progress.user_level_id = user_level.id
+                AND user_video_progress.is_completed
+            )
+    """)
+
+
+def downgrade():
+    with op.batch_alter_table('user_level', schema=None) as batch_op:
+        batch_op.drop_column('total_videos_count')
+        batch_op.drop_column('completed_videos_count')
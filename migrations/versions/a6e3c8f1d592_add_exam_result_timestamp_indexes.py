@@ -0,0 +1,26 @@
+"""add exam_result timestamp indexes
+
+Revision ID: a6e3c8f1d592
+Revises: d4b9e2f7a618
+Create Date: 2026-10-17 10:03:27.841956
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a6e3c8f1d592'
+down_revision = 'd4b9e2f7a618'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_exam_result_level_id_timestamp', 'exam_result', ['level_id', 'timestamp'], unique=False)
+    op.create_index('ix_exam_result_timestamp', 'exam_result', ['timestamp'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_exam_result_timestamp', table_name='exam_result')
+    op.drop_index('ix_exam_result_level_id_timestamp', table_name='exam_result')
@@ -0,0 +1,66 @@
+"""sparse video progress
+
+Revision ID: c5d1e7a3f902
+Revises: 9a4f6c2e8b15
+Create Date: 2026-10-17 06:18:55.730214
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c5d1e7a3f902'
+down_revision = '9a4f6c2e8b15'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('user_level', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('opened_through_video_id', sa.Integer(), nullable=True))
+
+    # The pointer covers the unbroken run of opened videos from the first
+    # one; a video opened after a gap (its predecessor was completed while
+    # still locked) keeps its row so the videos in the gap stay locked.
+    op.execute("""
+        UPDATE user_level SET opened_through_video_id = (
+            SELECT MAX(opened.video_id) FROM user_video_progress AS opened
+            WHERE opened.user_level_id = user_level.id
+            AND opened.is_opened
+            AND NOT EXISTS (
+                SELECT 1 FROM video
+                LEFT JOIN user_video_progress AS earlier
+                    ON earlier.user_level_id = user_level.id AND earlier.video_id = video.id
+                WHERE video.level_id = user_level.level_id
+                AND video.id <= opened.video_id
+                AND (earlier.id IS NULL OR NOT earlier.is_opened)
+            )
+        )
+    """)
+    op.execute("""
+        DELETE FROM user_video_progress
+        WHERE NOT is_completed
+        AND (NOT is_opened OR video_id <= (
+            SELECT opened_through_video_id FROM user_level
+            WHERE user_level.id = user_video_progress.user_level_id
+        ))
+    """)
+
+
+def downgrade():
+    op.execute("""
+        INSERT INTO user_video_progress (user_level_id, video_id, is_opened, is_completed)
+        SELECT user_level.id, video.id,
+            user_level.opened_through_video_id IS NOT NULL AND video.id <= user_level.opened_through_video_id,
+            0
+        FROM user_level JOIN video ON video.level_id = user_level.level_id
+        WHERE NOT EXISTS (
+            SELECT 1 FROM user_video_progress
+            WHERE user_video_progress.user_level_id = user_level.id
+            AND user_video_progress.video_id = video.id
+        )
+    """)
+
+    with op.batch_alter_table('user_level', schema=None) as batch_op:
+        batch_op.drop_column('opened_through_video_id')
@@ -0,0 +1,74 @@
+"""add statistics rollups
+
+Revision ID: d4b9e2f7a618
+Revises: f8c3a9e1b274
+Create Date: 2026-10-17 09:12:48.305117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd4b9e2f7a618'
+down_revision = 'f8c3a9e1b274'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('statistic',
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('value', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+    op.create_table('user_statistics',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('purchased_levels', sa.Integer(), nullable=False),
+    sa.Column('completed_levels', sa.Integer(), nullable=False),
+    sa.Column('initial_exams_count', sa.Integer(), nullable=False),
+    sa.Column('initial_score_total', sa.Float(), nullable=False),
+    sa.Column('final_exams_count', sa.Integer(), nullable=False),
+    sa.Column('final_score_total', sa.Float(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+    with op.batch_alter_table('level', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('purchases_count', sa.Integer(), nullable=False, server_default='0'))
+        batch_op.create_index(batch_op.f('ix_level_purchases_count'), ['purchases_count'], unique=False)
+
+    op.execute("""
+        INSERT INTO statistic (name, value)
+        SELECT 'total_users', COUNT(*) FROM "user" WHERE role = 'client'
+        UNION ALL SELECT 'total_levels', COUNT(*) FROM level
+        UNION ALL SELECT 'total_purchases', COUNT(*) FROM user_level
+        UNION ALL SELECT 'completed_levels', COUNT(*) FROM user_level WHERE user_level.is_completed
+    """)
+    op.execute("""
+        UPDATE level SET purchases_count = (
+            SELECT COUNT(*) FROM user_level WHERE user_level.level_id = level.id
+        )
+    """)
+    op.execute("""
+        INSERT INTO user_statistics (
+            user_id, purchased_levels, completed_levels,
+            initial_exams_count, initial_score_total, final_exams_count, final_score_total
+        )
+        SELECT "user".id,
+            (SELECT COUNT(*) FROM user_level WHERE user_level.user_id = "user".id),
+            (SELECT COUNT(*) FROM user_level WHERE user_level.user_id = "user".id AND user_level.is_completed),
+            (SELECT COUNT(*) FROM exam_result WHERE exam_result.user_id = "user".id AND exam_result.type = 'initial'),
+            (SELECT COALESCE(SUM(percentage), 0) FROM exam_result WHERE exam_result.user_id = "user".id AND exam_result.type = 'initial'),
+            (SELECT COUNT(*) FROM exam_result WHERE exam_result.user_id = "user".id AND exam_result.type = 'final'),
+            (SELECT COALESCE(SUM(percentage), 0) FROM exam_result WHERE exam_result.user_id = "user".id AND exam_result.type = 'final')
+        FROM "user"
+    """)
+
+
+def downgrade():
+    with op.batch_alter_table('level', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_level_purchases_count'))
+        batch_op.drop_column('purchases_count')
+
+    op.drop_table('user_statistics')
+    op.drop_table('statistic')
@@ -0,0 +1,28 @@
+"""add user_level progress bitsets
+
+Revision ID: e2a7b4d8c613
+Revises: c5d1e7a3f902
+Create Date: 2026-10-17 07:02:19.084411
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2a7b4d8c613'
+down_revision = 'c5d1e7a3f902'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('user_level', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('opened_bits', sa.LargeBinary(), nullable=True))
+        batch_op.add_column(sa.Column('completed_bits', sa.LargeBinary(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('user_level', schema=None) as batch_op:
+        batch_op.drop_column('completed_bits')
+        batch_op.drop_column('opened_bits')
@@ -0,0 +1,28 @@
+"""add content_version
+
+Revision ID: f8c3a9e1b274
+Revises: e2a7b4d8c613
+Create Date: 2026-10-17 07:45:32.691027
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f8c3a9e1b274'
+down_revision = 'e2a7b4d8c613'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('content_version',
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+
+
+def downgrade():
+    op.drop_table('content_version')
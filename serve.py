@@ -0,0 +1,107 @@
+"""
+Production launcher for Educational App
+Runs the app under gunicorn with a worker preset, or Werkzeug's threaded server where gunicorn is unavailable
+"""
+
+import argparse
+import logging
+import multiprocessing
+import os
+
+from app import create_app, db
+from app.config import Config
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+CPU_COUNT = multiprocessing.cpu_count()
+
+# Worker models for gunicorn. sync suits short CPU-bound requests, gthread
+# lets each process overlap database waits, gevent (pip install gevent)
+# multiplexes many slow clients per process.
+PRESETS = {
+    'sync': {'worker_class': 'sync', 'workers': CPU_COUNT * 2 + 1, 'preload_app': True},
+    'gthread': {'worker_class': 'gthread', 'workers': CPU_COUNT + 1, 'threads': 8, 'preload_app': True},
+    # Preloading imports the app before gevent patches the standard library
+    'gevent': {'worker_class': 'gevent', 'workers': CPU_COUNT + 1, 'worker_connections': 1000, 'preload_app': False},
+}
+
+class ProductionConfig(Config):
+    # The schema is created once by the launcher (--create-schema) or by
+    # `flask db upgrade`, never by each worker.
+    CREATE_SCHEMA_ON_STARTUP = False
+    # Import the routes up front so preloading shares them with every worker
+    LAZY_BLUEPRINTS = False
+
+def create_schema():
+    from app.database import create_schema as create_database_schema
+    app = create_app(ProductionConfig)
+    create_database_schema(app)
+    with app.app_context():
+        db.engine.dispose()
+
+def run_gunicorn(preset, bind, workers=None, threads=None, preload=None, timeout=30):
+    from gunicorn.app.base import BaseApplication
+
+    options = dict(PRESETS[preset], bind=bind, timeout=timeout, accesslog='-')
+    if workers:
+        options['workers'] = workers
+    if threads:
+        options['threads'] = threads
+    if preload is not None:
+        options['preload_app'] = preload
+
+    # With preload_app the app (and its connection pool) is created in the
+    # master; each worker drops the inherited connections after forking.
+    def post_fork(server, worker):
+        application = server.app.application
+        if application is not None:
+            with application.app_context():
+                db.engine.dispose(close=False)
+
+    options['post_fork'] = post_fork
+
+    class Server(BaseApplication):
+        application = None
+
+        def load_config(self):
+            for key, value in options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            if self.application is None:
+                self.application = create_app(ProductionConfig)
+            return self.application
+
+    logger.info(f"🚀 gunicorn {preset}: {options['workers']} workers on {bind}, preload={options['preload_app']}")
+    Server().run()
+
+def run_threaded(bind):
+    from werkzeug.serving import run_simple
+
+    host, port = bind.rsplit(':', 1)
+    logger.info(f"🚀 Werkzeug threaded server on {bind}")
+    run_simple(host, int(port), create_app(ProductionConfig), threaded=True, use_reloader=False, use_debugger=False)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--preset', choices=[*PRESETS, 'threaded'], default='gthread')
+    parser.add_argument('--bind', default=os.environ.get('BIND', '0.0.0.0:5000'))
+    parser.add_argument('--workers', type=int, help='Override the preset worker count')
+    parser.add_argument('--threads', type=int, help='Threads per worker (gthread)')
+    parser.add_argument('--preload', dest='preload', action='store_true', default=None, help='Load the app in the master before forking')
+    parser.add_argument('--no-preload', dest='preload', action='store_false')
+    parser.add_argument('--timeout', type=int, default=30)
+    parser.add_argument('--create-schema', action='store_true', help='Create the tables of an empty database once before starting (use `flask db upgrade` when migrating)')
+    args = parser.parse_args()
+
+    if args.create_schema:
+        create_schema()
+
+    if args.preset == 'threaded':
+        run_threaded(args.bind)
+    else:
+        run_gunicorn(args.preset, args.bind, args.workers, args.threads, args.preload, args.timeout)
+
+if __name__ == '__main__':
+    main()
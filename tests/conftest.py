@@ -0,0 +1,57 @@
+import pytest
+
+from app import create_app, db
+from app.config import Config
+from app.models import Level
+from app.statistics import record_level_created
+
+class TestConfig(Config):
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = 'sqlite://'
+    CREATE_SCHEMA_ON_STARTUP = True
+    BCRYPT_LOG_ROUNDS = 4
+    PASSWORD_HASH_WORKERS = 0
+    IMAGE_VARIANT_WORKERS = 0
+
+@pytest.fixture
+def make_app(tmp_path):
+    def make_app(**settings):
+        settings.setdefault('UPLOAD_FOLDER', str(tmp_path / 'Uploads' / 'levels'))
+        return create_app(type('TestConfig', (TestConfig,), settings))
+    return make_app
+
+@pytest.fixture
+def app(make_app):
+    return make_app()
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+# Registers a user and returns (id, headers carrying its token)
+@pytest.fixture
+def register(client):
+    def register(email, role='client'):
+        response = client.post('/register', json={'name': email, 'email': email, 'password': 'secret', 'role': role})
+        assert response.status_code == 201
+        return response.json['id'], {'Authorization': f"Bearer {response.json['token']}"}
+    return register
+
+# Creates a level with videos through the API and returns (level_id, video_ids)
+@pytest.fixture
+def add_level(app, client):
+    def add_level(headers, videos=0, price=10.0):
+        with app.app_context():
+            level = Level(name='Level', level_number=Level.query.count() + 1, price=price)
+            db.session.add(level)
+            record_level_created()
+            db.session.commit()
+            level_id = level.id
+        
+        video_ids = []
+        for index in range(videos):
+            response = client.post(f'/levels/{level_id}/videos', json={'youtube_link': f'https://youtu.be/{level_id}-{index}', 'questions': []}, headers=headers)
+            assert response.status_code == 201
+            video_ids.append(response.json['id'])
+        return level_id, video_ids
+    return add_level
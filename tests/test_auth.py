@@ -0,0 +1,114 @@
+import re
+
+import pytest
+from sqlalchemy import event
+
+from app import db
+
+@pytest.fixture
+def app(make_app):
+    return make_app(JWT_ROLE_CLAIMS=True)
+
+def select_user_statements(app, send):
+    statements = []
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if re.search(r'\bFROM user\b(?!_)', statement):
+            statements.append(statement)
+    
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        response = send()
+    finally:
+        event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+    return response, statements
+
+def test_role_claim_authorizes_without_loading_the_user(app, client, register):
+    user_id, headers = register('user@example.com')
+    assert client.get(f'/users/{user_id}/levels', headers=headers).status_code == 200
+    
+    response, statements = select_user_statements(app, lambda: client.get(f'/users/{user_id}/levels', headers=headers))
+    assert response.status_code == 200
+    assert statements == []
+
+def test_role_change_revokes_tokens(client, register):
+    _, admin_headers = register('admin@example.com', role='admin')
+    user_id, headers = register('user@example.com', role='admin')
+    assert client.get('/admin/users', headers=headers).status_code == 200
+    
+    assert client.put(f'/users/{user_id}', json={'role': 'client'}, headers=admin_headers).status_code == 200
+    assert client.get('/admin/users', headers=headers).status_code == 403
+    assert client.get(f'/users/{user_id}/levels', headers=headers).status_code == 401
+    
+    response = client.post('/login', json={'email': 'user@example.com', 'password': 'secret'})
+    headers = {'Authorization': f"Bearer {response.json['token']}"}
+    assert client.get(f'/users/{user_id}/levels', headers=headers).status_code == 200
+    assert client.get('/admin/users', headers=headers).status_code == 403
+
+def test_password_reset_revokes_tokens(client, register):
+    _, admin_headers = register('admin@example.com', role='admin')
+    user_id, headers = register('user@example.com')
+    assert client.get(f'/users/{user_id}/levels', headers=headers).status_code == 200
+    
+    response = client.post(f'/admin/users/{user_id}/reset_password', json={'new_password': 'changed'}, headers=admin_headers)
+    assert response.status_code == 200
+    assert client.get(f'/users/{user_id}/levels', headers=headers).status_code == 401
+
+def test_deleted_user_tokens_are_rejected(client, register):
+    _, admin_headers = register('admin@example.com', role='admin')
+    user_id, headers = register('user@example.com')
+    assert client.get(f'/users/{user_id}/levels', headers=headers).status_code == 200
+    
+    assert client.delete(f'/admin/users/{user_id}', headers=admin_headers).status_code == 200
+    assert client.get(f'/users/{user_id}/levels', headers=headers).status_code == 401
+
+def test_role_change_in_another_worker_reaches_cached_identities(make_app):
+    from app import cache
+    from app.auth import bump_token_version
+    from app.models import User
+    
+    app = make_app(JWT_ROLE_CLAIMS=False)
+    client = app.test_client()
+    response = client.post('/register', json={'name': 'Admin', 'email': 'admin@example.com', 'password': 'secret', 'role': 'admin'})
+    user_id, headers = response.json['id'], {'Authorization': f"Bearer {response.json['token']}"}
+    assert client.get('/admin/users', headers=headers).status_code == 200
+    
+    # What update_user does in another process: this process's identity
+    # cache still holds the admin role, only the shared cache is told
+    with app.app_context():
+        user = db.session.get(User, user_id)
+        user.role = 'client'
+        bump_token_version(user)
+        db.session.commit()
+        cache.delete(f'token_version:{user_id}')
+    
+    assert client.get('/admin/users', headers=headers).status_code == 403
+    assert client.get(f'/users/{user_id}/levels', headers=headers).status_code == 200
+
+def test_login_checks_the_password_outside_a_transaction(app, client, register, monkeypatch):
+    from app import password_hasher
+    from app.models import User
+    from app.passwords import hash_cost, hash_password
+    
+    user_id, _ = register('user@example.com')
+    with app.app_context():
+        db.session.get(User, user_id).password = hash_password('secret', 5)
+        db.session.commit()
+    
+    in_transaction = []
+    check_password_hash = password_hasher.check_password_hash
+    def checking(pw_hash, password):
+        in_transaction.append(db.session().in_transaction())
+        return check_password_hash(pw_hash, password)
+    monkeypatch.setattr(password_hasher, 'check_password_hash', checking)
+    
+    response = client.post('/login', json={'email': 'user@example.com', 'password': 'secret'})
+    assert response.status_code == 200
+    assert response.json['id'] == user_id
+    assert in_transaction == [False]
+    
+    # The outdated cost is rehashed to BCRYPT_LOG_ROUNDS
+    with app.app_context():
+        assert hash_cost(db.session.get(User, user_id).password) == 4
+    assert client.post('/login', json={'email': 'user@example.com', 'password': 'wrong'}).status_code == 401
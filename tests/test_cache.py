@@ -0,0 +1,108 @@
+import socket
+import threading
+
+import pytest
+
+from app.cache import Cache, CacheBackend, CacheServer, MemoryBackend, RedisBackend
+
+@pytest.fixture
+def cache_server():
+    server = CacheServer(('127.0.0.1', 0))
+    thread = threading.Thread(target=server.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+@pytest.fixture
+def backend(cache_server):
+    host, port = cache_server.server_address
+    return RedisBackend(f'redis://{host}:{port}/0')
+
+def unused_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def test_backend_is_abstract():
+    with pytest.raises(TypeError):
+        CacheBackend()
+
+def test_get_set_delete_incr(backend):
+    assert backend.get('missing') is None
+    
+    backend.set('catalog', {'levels': [1, 2], 'name': 'Niveau é'})
+    assert backend.get('catalog') == {'levels': [1, 2], 'name': 'Niveau é'}
+    
+    backend.delete('catalog')
+    assert backend.get('catalog') is None
+    
+    assert backend.incr('counter') == 1
+    assert backend.incr('counter') == 2
+    assert backend.get('counter') == 2
+    assert backend.errors == 0
+
+def test_tag_invalidation(backend):
+    cache = Cache(backend)
+    cache.set('statistics', {'total_users': 1}, tags=('statistics',))
+    cache.set('catalog', [1], tags=('catalog',))
+    assert cache.get('statistics', tags=('statistics',)) == {'total_users': 1}
+    
+    # Another process sharing the server sees the bump
+    Cache(RedisBackend(f'redis://{backend.host}:{backend.port}/0')).invalidate_tags('statistics')
+    assert cache.get('statistics', tags=('statistics',)) is None
+    assert cache.get('catalog', tags=('catalog',)) == [1]
+
+def test_connection_failure_is_a_miss():
+    backend = RedisBackend(f'redis://127.0.0.1:{unused_port()}/0')
+    backend.set('key', 'value')
+    assert backend.get('key') is None
+    assert backend.incr('counter') is None
+    assert backend.errors == 3
+    
+    cache = Cache(backend)
+    assert cache.get('key', tags=('statistics',)) is None
+    assert cache.memoize()(lambda: 'computed')() == 'computed'
+
+def test_shared_memoize_skips_per_process_backends(backend):
+    calls = []
+    def compute():
+        calls.append(1)
+        return len(calls)
+    
+    memory_cached = Cache(MemoryBackend()).memoize(shared=True)(compute)
+    assert [memory_cached(), memory_cached()] == [1, 2]
+    
+    shared_cached = Cache(backend).memoize(shared=True)(compute)
+    assert [shared_cached(), shared_cached()] == [3, 3]
+
+def test_clear_keeps_other_prefixes(backend):
+    other = RedisBackend(f'redis://{backend.host}:{backend.port}/0', key_prefix='other_app:')
+    other.set('session', 'kept')
+    odd = RedisBackend(f'redis://{backend.host}:{backend.port}/0', key_prefix='app[1]*:')
+    odd.set('catalog', [2])
+    backend.set('catalog', [1])
+    backend.incr('tag:catalog')
+    
+    backend.clear()
+    assert backend.get('catalog') is None
+    assert backend.get('tag:catalog') is None
+    assert other.get('session') == 'kept'
+    assert odd.get('catalog') == [2]
+    
+    odd.clear()
+    assert odd.get('catalog') is None
+    assert other.get('session') == 'kept'
+    assert backend.errors == other.errors == odd.errors == 0
+
+def test_question_cache_wraps_a_memory_backend():
+    from types import SimpleNamespace
+    from app.queries import QuestionCache
+    
+    questions = QuestionCache(max_size=1)
+    video = SimpleNamespace(id=1, revision=0, questions='[{"question": "Q"}]')
+    assert questions.get(video) is questions.get(video)
+    
+    questions.forget(video)
+    assert questions.entries.get((1, 0)) is None
+    assert questions.get(SimpleNamespace(id=2, revision=0, questions=None)) == []
@@ -0,0 +1,50 @@
+import gzip
+import json
+
+import pytest
+
+@pytest.fixture
+def catalog(client, register, add_level):
+    _, admin_headers = register('admin@example.com', role='admin')
+    for _ in range(6):
+        add_level(admin_headers, videos=3)
+    _, headers = register('user@example.com')
+    return headers
+
+def test_not_modified_repeats_the_weak_etag(client, catalog):
+    headers = {**catalog, 'Accept-Encoding': 'gzip'}
+    response = client.get('/levels', headers=headers)
+    assert response.status_code == 200
+    assert response.headers['Content-Encoding'] == 'gzip'
+    etag = response.headers['ETag']
+    assert etag.startswith('W/"')
+    
+    response = client.get('/levels', headers={**headers, 'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.headers['ETag'] == etag
+    assert 'Accept-Encoding' in response.vary
+    
+    # A client holding the uncompressed representation keeps the strong validator
+    response = client.get('/levels', headers={**catalog, 'Accept-Encoding': 'identity'})
+    assert 'Content-Encoding' not in response.headers
+    strong = response.headers['ETag']
+    assert strong == etag[2:]
+    response = client.get('/levels', headers={**catalog, 'Accept-Encoding': 'identity', 'If-None-Match': strong})
+    assert response.status_code == 304
+    assert response.headers['ETag'] == strong
+
+def test_levels_are_gzip_encoded(client, catalog):
+    plain = client.get('/levels', headers={**catalog, 'Accept-Encoding': 'identity'})
+    assert 'Content-Encoding' not in plain.headers
+    
+    response = client.get('/levels', headers={**catalog, 'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in response.vary
+    body = gzip.decompress(response.get_data())
+    assert len(response.get_data()) < len(body)
+    assert json.loads(body) == plain.json
+    
+    # Bodies under COMPRESS_MIN_SIZE are sent as they are
+    response = client.get('/levels', headers={**catalog, 'Accept-Encoding': 'gzip'}, query_string={'name': 'missing'})
+    assert response.json == []
+    assert 'Content-Encoding' not in response.headers
@@ -0,0 +1,127 @@
+import json
+
+import pytest
+from sqlalchemy import event
+
+from app import db
+
+# Statements issued by GET /levels on a cold catalog cache: content version,
+# levels, videos, the user's levels and their video progress, plus enrollment
+# counts for admins. None of them depend on how many levels or videos exist.
+LEVELS_STATEMENTS = {'client': 5, 'admin': 6}
+
+def count_statements(app, send):
+    statements = []
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        response = send()
+    finally:
+        event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+    return response, statements
+
+@pytest.mark.parametrize('role', ['client', 'admin'])
+@pytest.mark.parametrize('levels, videos', [(1, 1), (3, 4), (8, 6)])
+def test_levels_query_count(app, client, register, add_level, role, levels, videos):
+    _, admin_headers = register('admin@example.com', role='admin')
+    user_id, headers = register('user@example.com', role=role)
+    
+    for _ in range(levels):
+        level_id, video_ids = add_level(admin_headers, videos=videos)
+        assert client.post(f'/users/{user_id}/levels/{level_id}/purchase', headers=headers).status_code == 201
+        for video_id in video_ids[:-1]:
+            assert client.patch(f'/users/{user_id}/levels/{level_id}/videos/{video_id}/complete', headers=headers).status_code == 200
+    
+    response, statements = count_statements(app, lambda: client.get('/levels', headers=headers))
+    assert response.status_code == 200
+    assert len(response.json) == levels
+    assert all(len(level['videos']) == videos for level in response.json)
+    assert len(statements) == LEVELS_STATEMENTS[role], statements
+    
+    # The cached catalog skips the level and video queries
+    response, statements = count_statements(app, lambda: client.get('/levels', headers=headers))
+    assert response.status_code == 200
+    assert len(statements) == LEVELS_STATEMENTS[role] - 2, statements
+
+def test_admin_levels_order(app, client, register):
+    from app.models import Level
+    
+    _, headers = register('admin@example.com', role='admin')
+    with app.app_context():
+        for number, name in enumerate(['Charlie', 'Alpha', 'Bravo'], 1):
+            db.session.add(Level(name=name, level_number=number, price=10.0))
+        db.session.commit()
+    
+    names = [level['name'] for level in client.get('/admin/levels', headers=headers).json]
+    assert names == ['Alpha', 'Bravo', 'Charlie']
+    
+    first = client.get('/admin/levels?limit=2', headers=headers)
+    rest = client.get(f"/admin/levels?after={first.headers['X-Next-After']}", headers=headers)
+    assert [level['name'] for level in first.json + rest.json] == ['Charlie', 'Alpha', 'Bravo']
+
+@pytest.fixture
+def exams(app, register, add_level):
+    from datetime import datetime
+    from app.models import ExamResult
+    
+    _, headers = register('admin@example.com', role='admin')
+    first_user, _ = register('first@example.com')
+    second_user, _ = register('second@example.com')
+    first_level, _ = add_level(headers)
+    second_level, _ = add_level(headers)
+    with app.app_context():
+        for user_id, level_id, exam_type, day in [
+            (first_user, first_level, 'initial', 1),
+            (first_user, first_level, 'final', 2),
+            (second_user, first_level, 'initial', 3),
+            (second_user, second_level, 'initial', 4),
+            (first_user, second_level, 'final', 5),
+        ]:
+            db.session.add(ExamResult(user_id=user_id, level_id=level_id, type=exam_type, correct_words=8, wrong_words=2,
+                                      percentage=80.0, timestamp=datetime(2024, 1, day, 12)))
+        db.session.commit()
+    return headers, {'first_user': first_user, 'second_user': second_user, 'first_level': first_level, 'second_level': second_level}
+
+def exam_days(response):
+    assert response.status_code == 200
+    return [int(exam['timestamp'][8:10]) for exam in response.json]
+
+def test_exam_results_filters(client, exams):
+    headers, ids = exams
+    
+    assert exam_days(client.get('/admin/exams', headers=headers)) == [1, 2, 3, 4, 5]
+    assert exam_days(client.get(f"/admin/exams?level_id={ids['first_level']}", headers=headers)) == [1, 2, 3]
+    assert exam_days(client.get(f"/admin/exams?user_id={ids['first_user']}", headers=headers)) == [1, 2, 5]
+    assert exam_days(client.get('/admin/exams?type=final', headers=headers)) == [2, 5]
+    assert exam_days(client.get('/admin/exams?start=2024-01-02&end=2024-01-04', headers=headers)) == [2, 3]
+    assert exam_days(client.get('/admin/exams?start=2024-01-03T12:00:00', headers=headers)) == [3, 4, 5]
+    assert exam_days(client.get(f"/admin/exams?user_id={ids['second_user']}&type=initial&end=2024-01-04", headers=headers)) == [3]
+    
+    response = client.get('/admin/exams', headers=headers)
+    assert response.json[0]['user_name'] == 'first@example.com'
+    assert response.json[0]['level_name'] == 'Level'
+
+@pytest.mark.parametrize('query', ['start=yesterday', 'end=2024-13-01', 'start=2024-01-01&end=soon'])
+def test_exam_results_reject_bad_dates(client, exams, query):
+    headers, _ = exams
+    response = client.get(f'/admin/exams?{query}', headers=headers)
+    assert response.status_code == 400
+    assert response.json == {'message': 'start and end must be ISO 8601 dates'}
+
+def test_exam_results_pages_combine_with_filters(client, exams):
+    headers, ids = exams
+    
+    query = f"user_id={ids['first_user']}&start=2024-01-01&limit=2"
+    first = client.get(f'/admin/exams?{query}', headers=headers)
+    assert exam_days(first) == [1, 2]
+    
+    rest = client.get(f"/admin/exams?{query}&after={first.headers['X-Next-After']}", headers=headers)
+    assert exam_days(rest) == [5]
+    assert 'X-Next-After' not in rest.headers
+    
+    streamed = client.get(f"/admin/exams?level_id={ids['first_level']}&type=initial&stream=ndjson", headers=headers)
+    assert [json.loads(line)['timestamp'][8:10] for line in streamed.get_data(as_text=True).splitlines()] == ['01', '03']
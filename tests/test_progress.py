@@ -0,0 +1,153 @@
+import pytest
+
+@pytest.fixture(params=['rows', 'bitset'])
+def app(make_app, request):
+    return make_app(PROGRESS_STORAGE=request.param)
+
+@pytest.fixture
+def purchased(client, register, add_level):
+    _, admin_headers = register('admin@example.com', role='admin')
+    user_id, headers = register('user@example.com')
+    level_id, video_ids = add_level(admin_headers, videos=3)
+    assert client.post(f'/users/{user_id}/levels/{level_id}/purchase', headers=headers).status_code == 201
+    return user_id, headers, admin_headers, level_id, video_ids
+
+def user_level(client, user_id, headers):
+    response = client.get(f'/users/{user_id}/levels', headers=headers)
+    assert response.status_code == 200
+    return response.json[0]
+
+def video_states(level):
+    return [(video['is_opened'], video['is_completed']) for video in level['videos_progress']]
+
+def complete(client, user_id, headers, level_id, video_id):
+    response = client.patch(f'/users/{user_id}/levels/{level_id}/videos/{video_id}/complete', headers=headers)
+    assert response.status_code == 200
+
+def test_purchase_opens_only_the_first_video(client, purchased):
+    user_id, headers, _, level_id, video_ids = purchased
+    
+    level = user_level(client, user_id, headers)
+    assert video_states(level) == [(True, False), (False, False), (False, False)]
+    assert (level['completed_videos_count'], level['total_videos_count']) == (0, 3)
+    assert not level['can_take_final_exam']
+    assert not level['is_completed']
+    
+    videos = client.get(f'/levels/{level_id}', headers=headers).json['videos']
+    assert [video['is_opened'] for video in videos] == [True, False, False]
+
+def test_completing_videos_opens_the_next_and_the_final_exam(client, purchased):
+    user_id, headers, _, level_id, video_ids = purchased
+    
+    complete(client, user_id, headers, level_id, video_ids[0])
+    level = user_level(client, user_id, headers)
+    assert video_states(level) == [(True, True), (True, False), (False, False)]
+    assert level['completed_videos_count'] == 1
+    assert not level['can_take_final_exam']
+    
+    complete(client, user_id, headers, level_id, video_ids[1])
+    complete(client, user_id, headers, level_id, video_ids[2])
+    level = user_level(client, user_id, headers)
+    assert video_states(level) == [(True, True)] * 3
+    assert (level['completed_videos_count'], level['total_videos_count']) == (3, 3)
+    assert level['can_take_final_exam']
+    assert not level['is_completed']
+    
+    # Completing a video twice does not count it twice
+    complete(client, user_id, headers, level_id, video_ids[2])
+    assert user_level(client, user_id, headers)['completed_videos_count'] == 3
+
+def test_video_added_after_purchase(client, purchased):
+    user_id, headers, admin_headers, level_id, video_ids = purchased
+    complete(client, user_id, headers, level_id, video_ids[0])
+    
+    response = client.post(f'/levels/{level_id}/videos', json={'youtube_link': 'https://youtu.be/new', 'questions': []}, headers=admin_headers)
+    assert response.status_code == 201
+    level = user_level(client, user_id, headers)
+    assert video_states(level) == [(True, True), (True, False), (False, False), (False, False)]
+    assert (level['completed_videos_count'], level['total_videos_count']) == (1, 4)
+    
+    for video_id in video_ids[1:] + [response.json['id']]:
+        complete(client, user_id, headers, level_id, video_id)
+    level = user_level(client, user_id, headers)
+    assert video_states(level) == [(True, True)] * 4
+    assert level['can_take_final_exam']
+
+def test_video_added_after_final_exam_unlocked(client, purchased):
+    user_id, headers, admin_headers, level_id, video_ids = purchased
+    for video_id in video_ids:
+        complete(client, user_id, headers, level_id, video_id)
+    
+    client.post(f'/levels/{level_id}/videos', json={'youtube_link': 'https://youtu.be/new', 'questions': []}, headers=admin_headers)
+    level = user_level(client, user_id, headers)
+    assert video_states(level) == [(True, True)] * 3 + [(False, False)]
+    assert (level['completed_videos_count'], level['total_videos_count']) == (3, 4)
+    assert level['can_take_final_exam']
+
+def test_completed_video_deleted_after_purchase(client, purchased):
+    user_id, headers, admin_headers, level_id, video_ids = purchased
+    complete(client, user_id, headers, level_id, video_ids[0])
+    
+    assert client.delete(f'/videos/{video_ids[0]}', headers=admin_headers).status_code == 200
+    level = user_level(client, user_id, headers)
+    assert [video['video_id'] for video in level['videos_progress']] == video_ids[1:]
+    assert video_states(level) == [(True, False), (False, False)]
+    assert (level['completed_videos_count'], level['total_videos_count']) == (0, 2)
+    assert not level['can_take_final_exam']
+
+def test_last_open_video_deleted_unlocks_the_final_exam(client, purchased):
+    user_id, headers, admin_headers, level_id, video_ids = purchased
+    complete(client, user_id, headers, level_id, video_ids[0])
+    complete(client, user_id, headers, level_id, video_ids[1])
+    
+    assert client.delete(f'/videos/{video_ids[2]}', headers=admin_headers).status_code == 200
+    level = user_level(client, user_id, headers)
+    assert video_states(level) == [(True, True), (True, True)]
+    assert (level['completed_videos_count'], level['total_videos_count']) == (2, 2)
+    assert level['can_take_final_exam']
+
+def test_completing_a_locked_video_opens_only_the_next(client, register, add_level):
+    _, admin_headers = register('admin@example.com', role='admin')
+    user_id, headers = register('user@example.com')
+    level_id, video_ids = add_level(admin_headers, videos=4)
+    assert client.post(f'/users/{user_id}/levels/{level_id}/purchase', headers=headers).status_code == 201
+    
+    complete(client, user_id, headers, level_id, video_ids[2])
+    level = user_level(client, user_id, headers)
+    assert video_states(level) == [(True, False), (False, False), (False, True), (True, False)]
+    assert level['completed_videos_count'] == 1
+    
+    # Locked videos are still sent without their content
+    videos = client.get('/levels', headers=headers).json[0]['videos']
+    assert [video['is_opened'] for video in videos] == [True, False, False, True]
+    assert [bool(video['youtube_link']) for video in videos] == [True, False, False, True]
+    
+    # Catching up in order opens the gap without closing anything
+    complete(client, user_id, headers, level_id, video_ids[0])
+    level = user_level(client, user_id, headers)
+    assert video_states(level) == [(True, True), (True, False), (False, True), (True, False)]
+    
+    complete(client, user_id, headers, level_id, video_ids[1])
+    complete(client, user_id, headers, level_id, video_ids[3])
+    level = user_level(client, user_id, headers)
+    assert video_states(level) == [(True, True), (True, True), (True, True), (True, True)]
+    assert level['can_take_final_exam']
+
+def test_converting_storage_keeps_out_of_order_progress(app, client, register, add_level):
+    from app.progress import convert_progress_storage
+    
+    _, admin_headers = register('admin@example.com', role='admin')
+    user_id, headers = register('user@example.com')
+    level_id, video_ids = add_level(admin_headers, videos=5)
+    assert client.post(f'/users/{user_id}/levels/{level_id}/purchase', headers=headers).status_code == 201
+    complete(client, user_id, headers, level_id, video_ids[0])
+    complete(client, user_id, headers, level_id, video_ids[3])
+    expected = [(True, True), (True, False), (False, False), (False, True), (True, False)]
+    assert video_states(user_level(client, user_id, headers)) == expected
+    
+    storage = app.config['PROGRESS_STORAGE']
+    for layout in ('bitset' if storage == 'rows' else 'rows', storage):
+        with app.app_context():
+            convert_progress_storage(layout)
+        app.config['PROGRESS_STORAGE'] = layout
+        assert video_states(user_level(client, user_id, headers)) == expected
@@ -0,0 +1,35 @@
+from app.statistics import admin_statistics, rebuild_statistics
+
+def test_fresh_database_has_no_drift(app):
+    with app.app_context():
+        assert rebuild_statistics() == []
+
+def test_rollups_match_a_recompute(app, client, register, add_level):
+    _, admin_headers = register('admin@example.com', role='admin')
+    user_id, headers = register('user@example.com')
+    other_id, other_headers = register('other@example.com')
+    level_id, video_ids = add_level(admin_headers, videos=2)
+    other_level_id, _ = add_level(admin_headers, videos=1)
+    
+    for purchaser_id, purchaser_headers in ((user_id, headers), (other_id, other_headers)):
+        for purchased_level_id in (level_id, other_level_id):
+            assert client.post(f'/users/{purchaser_id}/levels/{purchased_level_id}/purchase', headers=purchaser_headers).status_code == 201
+    
+    exam = {'correct_words': 8, 'wrong_words': 2}
+    assert client.post(f'/exams/{level_id}/initial', json=exam, headers=headers).status_code == 201
+    for video_id in video_ids:
+        assert client.patch(f'/users/{user_id}/levels/{level_id}/videos/{video_id}/complete', headers=headers).status_code == 200
+    assert client.post(f'/exams/{level_id}/final', json=exam, headers=headers).status_code == 201
+    assert client.delete(f'/levels/{other_level_id}', headers=admin_headers).status_code == 200
+    assert client.delete(f'/admin/users/{other_id}', headers=admin_headers).status_code == 200
+    
+    with app.app_context():
+        assert admin_statistics() == {
+            'total_users': 1,
+            'total_levels': 1,
+            'total_purchases': 1,
+            'completed_levels': 1,
+            'completion_rate': 100.0,
+            'popular_levels': [{'name': 'Level', 'purchases': 1}]
+        }
+        assert rebuild_statistics() == []
@@ -0,0 +1,59 @@
+import io
+import os
+
+import pytest
+
+def upload_image(client, headers, level_id, data, filename='image.png'):
+    response = client.put(f'/levels/{level_id}', data={'file': (io.BytesIO(data), filename)}, headers=headers, content_type='multipart/form-data')
+    assert response.status_code == 200
+    return response.json['image_path']
+
+def png(width, height):
+    Image = pytest.importorskip('PIL.Image')
+    buffer = io.BytesIO()
+    Image.new('RGB', (width, height), (200, 80, 40)).save(buffer, 'PNG')
+    return buffer.getvalue()
+
+def test_duplicate_uploads_share_one_file_until_collected(app, client, register, add_level):
+    from app.uploads import collect_upload_garbage
+    
+    app.config['IMAGE_VARIANT_WIDTHS'] = ''
+    _, headers = register('admin@example.com', role='admin')
+    first_id, _ = add_level(headers)
+    second_id, _ = add_level(headers)
+    folder = app.config['UPLOAD_FOLDER']
+    
+    image_path = upload_image(client, headers, first_id, b'same bytes')
+    assert upload_image(client, headers, second_id, b'same bytes', filename='copy.png') == image_path
+    assert os.listdir(folder) == [os.path.basename(image_path)]
+    
+    # Still referenced by the second level
+    assert client.delete(f'/levels/{first_id}', headers=headers).status_code == 200
+    assert os.listdir(folder) == [os.path.basename(image_path)]
+    
+    # Unreferenced, but kept for UPLOAD_GC_GRACE seconds after it was stored
+    other_path = upload_image(client, headers, second_id, b'other bytes')
+    assert sorted(os.listdir(folder)) == sorted([os.path.basename(image_path), os.path.basename(other_path)])
+    with app.app_context():
+        assert collect_upload_garbage() == []
+        app.config['UPLOAD_GC_GRACE'] = 0
+        assert collect_upload_garbage() == [(os.path.basename(image_path), len(b'same bytes'))]
+    assert os.listdir(folder) == [os.path.basename(other_path)]
+
+def test_levels_list_image_srcset(app, client, register, add_level):
+    data = png(400, 200)
+    _, admin_headers = register('admin@example.com', role='admin')
+    level_id, _ = add_level(admin_headers)
+    image_path = upload_image(client, admin_headers, level_id, data)
+    _, headers = register('user@example.com')
+    
+    level = client.get('/levels', headers=headers).json[0]
+    assert level['image_path'] == image_path
+    
+    # Variants are never wider than the 400px original
+    stem = image_path.rsplit('.', 1)[0]
+    assert level['image_srcset'] == {
+        'webp': f'{stem}-w160.webp 160w, {stem}-w320.webp 320w',
+        'jpeg': f'{stem}-w160.jpg 160w, {stem}-w320.jpg 320w'
+    }
+    assert client.get(f'{stem}-w320.webp').status_code == 200